@@ -6,10 +6,12 @@ for tool execution, state management, and communication.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Awaitable, Callable, ClassVar, List, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime
+import asyncio
 import logging
+import time
 
 from ..tools.base import BaseTool
 from ..orchestration.context import OrchestrationContext
@@ -17,15 +19,32 @@ from ..orchestration.context import OrchestrationContext
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentState:
     """Internal state of an agent"""
     name: str
     initialized: bool = False
     tools: Dict[str, BaseTool] = field(default_factory=dict)
     execution_count: int = 0
-    last_execution: Optional[datetime] = None
+    last_execution_ts: Optional[float] = None  # time.time() of last execution
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _last_execution_iso: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def last_execution(self) -> Optional[datetime]:
+        """Time of the last execution as a datetime"""
+        if self.last_execution_ts is None:
+            return None
+        return datetime.fromtimestamp(self.last_execution_ts)
+    
+    @property
+    def last_execution_iso(self) -> Optional[str]:
+        """ISO-formatted time of the last execution, cached until the next one"""
+        if self._last_execution_iso is None and self.last_execution_ts is not None:
+            self._last_execution_iso = self.last_execution.isoformat()
+        return self._last_execution_iso
 
 
 class BaseAgent(ABC):
@@ -36,18 +55,33 @@ class BaseAgent(ABC):
     - Pose Agent: Exercise form analysis
     - Nutrition Agent: Food classification and nutrition estimation
     - Mindfulness Agent: Coaching and journaling
+    
+    Tools may be registered eagerly as instances or lazily as factories, which
+    are only constructed the first time the tool is used.
     """
     
+    # Tools used by execute, reported for telemetry
+    TOOLS_USED: ClassVar[Tuple[str, ...]] = ()
+    
+    # Process-wide cache of loaded model handles, shared by all agent instances
+    _models: ClassVar[Dict[str, Any]] = {}
+    _models_lock: ClassVar[Optional[asyncio.Lock]] = None
+    
     def __init__(
         self,
         name: str,
         description: str,
-        tools: Optional[List[BaseTool]] = None
+        tools: Optional[List[BaseTool]] = None,
+        tool_factories: Optional[Dict[str, Callable[[], BaseTool]]] = None
     ):
         self.name = name
         self.description = description
         self.state = AgentState(name=name)
         self._tools = {tool.name: tool for tool in (tools or [])}
+        self._tool_factories = dict(tool_factories or {})
+        self._tool_names: Tuple[str, ...] = tuple(
+            dict.fromkeys([*self._tools, *self._tool_factories])
+        )
         self.state.tools = self._tools
         
     @abstractmethod
@@ -71,8 +105,8 @@ class BaseAgent(ABC):
     def register_tool(self, tool: BaseTool) -> None:
         """Register a tool for this agent"""
         self._tools[tool.name] = tool
-        self.state.tools = self._tools
-        logger.info(f"Registered tool {tool.name} for agent {self.name}")
+        self._tool_names = tuple(dict.fromkeys([*self._tool_names, tool.name]))
+        logger.info("Registered tool %s for agent %s", tool.name, self.name)
     
     async def use_tool(
         self,
@@ -91,26 +125,65 @@ class BaseAgent(ABC):
         Returns:
             Tool execution result
         """
-        if tool_name not in self._tools:
-            raise ValueError(f"Tool {tool_name} not found for agent {self.name}")
-        
-        tool = self._tools[tool_name]
+        tool = self._get_tool(tool_name)
         
         try:
             result = await tool.execute(parameters, context)
-            logger.debug(f"Tool {tool_name} executed successfully for agent {self.name}")
+            logger.debug("Tool %s executed successfully for agent %s", tool_name, self.name)
             return result
         except Exception as e:
-            logger.error(f"Error executing tool {tool_name}: {str(e)}", exc_info=True)
+            logger.error(
+                "Error executing tool %s: %s", tool_name, e,
+                exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
             raise
     
-    def get_available_tools(self) -> List[str]:
-        """Get list of available tool names"""
-        return list(self._tools.keys())
+    def _get_tool(self, tool_name: str) -> BaseTool:
+        """Get a registered tool, constructing it from its factory on first use"""
+        tool = self._tools.get(tool_name)
+        if tool is None:
+            factory = self._tool_factories.get(tool_name)
+            if factory is None:
+                raise ValueError(f"Tool {tool_name} not found for agent {self.name}")
+            tool = factory()
+            self._tools[tool_name] = tool
+        return tool
+    
+    async def load_model(
+        self,
+        model_name: str,
+        loader: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """
+        Get a model handle, loading it once per process on first use.
+        
+        Args:
+            model_name: Cache key for the model
+            loader: Coroutine function that loads and returns the model
+            
+        Returns:
+            Loaded model handle
+        """
+        model = BaseAgent._models.get(model_name)
+        if model is not None:
+            return model
+        
+        if BaseAgent._models_lock is None:
+            BaseAgent._models_lock = asyncio.Lock()
+        
+        async with BaseAgent._models_lock:
+            # Another coroutine may have finished loading while we waited
+            if model_name not in BaseAgent._models:
+                BaseAgent._models[model_name] = await loader()
+            return BaseAgent._models[model_name]
+    
+    def get_available_tools(self) -> Tuple[str, ...]:
+        """Get available tool names"""
+        return self._tool_names
     
-    def get_tools_used(self) -> List[str]:
-        """Get list of tools used in last execution (to be overridden)"""
-        return []
+    def get_tools_used(self) -> Tuple[str, ...]:
+        """Get tools used in execution (set TOOLS_USED in subclasses)"""
+        return self.TOOLS_USED
     
     async def initialize(self) -> None:
         """Initialize the agent (load models, connect to services, etc.)"""
@@ -120,9 +193,12 @@ class BaseAgent(ABC):
         try:
             await self._initialize()
             self.state.initialized = True
-            logger.info(f"Agent {self.name} initialized successfully")
+            logger.info("Agent %s initialized successfully", self.name)
         except Exception as e:
-            logger.error(f"Failed to initialize agent {self.name}: {str(e)}", exc_info=True)
+            logger.error(
+                "Failed to initialize agent %s: %s", self.name, e,
+                exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
             raise
     
     @abstractmethod
@@ -136,7 +212,7 @@ class BaseAgent(ABC):
             "name": self.state.name,
             "initialized": self.state.initialized,
             "execution_count": self.state.execution_count,
-            "last_execution": self.state.last_execution.isoformat() if self.state.last_execution else None,
+            "last_execution": self.state.last_execution_iso,
             "available_tools": self.get_available_tools(),
             "metadata": self.state.metadata
         }
@@ -144,5 +220,6 @@ class BaseAgent(ABC):
     def _update_execution_state(self) -> None:
         """Update state after execution"""
         self.state.execution_count += 1
-        self.state.last_execution = datetime.now()
+        self.state.last_execution_ts = time.time()
+        self.state._last_execution_iso = None
 
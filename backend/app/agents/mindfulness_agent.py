@@ -5,7 +5,8 @@ Provides short mindfulness micro-lessons, journaling prompts,
 and motivational coaching using LLM capabilities.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any
+import asyncio
 import logging
 
 from .base import BaseAgent
@@ -25,26 +26,34 @@ class MindfulnessAgent(BaseAgent):
     Agent responsible for mindfulness coaching and mental resilience.
     """
     
+    TOOLS_USED = ("generate_micro_lesson", "create_journal_prompt", "analyze_mood", "generate_breathing_guide")
+    
+    # Coaching LLM, loaded lazily on first execution
+    MODEL_NAME = "llama3.1-8b"
+    
     def __init__(self):
-        tools = [
-            GenerateMicroLessonTool(),
-            CreateJournalPromptTool(),
-            AnalyzeMoodTool(),
-            GenerateBreathingGuideTool()
-        ]
         super().__init__(
             name="mindfulness",
             description="Mindfulness coaching and grit micro-lessons",
-            tools=tools
+            tool_factories={
+                "generate_micro_lesson": GenerateMicroLessonTool.get,
+                "create_journal_prompt": CreateJournalPromptTool.get,
+                "analyze_mood": AnalyzeMoodTool.get,
+                "generate_breathing_guide": GenerateBreathingGuideTool.get
+            }
         )
         self.llm_model = None
         
     async def _initialize(self) -> None:
-        """Initialize LLM model"""
+        """Nothing to do eagerly; the LLM is loaded on first use"""
+    
+    async def _load_llm_model(self) -> Any:
+        """Load LLM model"""
         logger.info("Initializing mindfulness LLM model...")
         # In production, load Llama 3.1 8B, Gemma 2 9B, or similar
-        self.llm_model = "llama3.1-8b"  # Placeholder
+        model = self.MODEL_NAME  # Placeholder
         logger.info("Mindfulness LLM model initialized")
+        return model
     
     async def execute(
         self,
@@ -70,10 +79,11 @@ class MindfulnessAgent(BaseAgent):
         user_history = task.get("user_history", "")
         
         try:
-            # Analyze mood if hint provided
-            mood_analysis = None
+            self.llm_model = await self.load_model(self.MODEL_NAME, self._load_llm_model)
+            
+            # Phase 1: mood analysis and breathing guide are independent
             if mood_hint:
-                mood_analysis = await self.use_tool(
+                mood_coro = self.use_tool(
                     "analyze_mood",
                     {
                         "mood_hint": mood_hint,
@@ -82,39 +92,43 @@ class MindfulnessAgent(BaseAgent):
                     },
                     context
                 )
+            else:
+                mood_coro = asyncio.sleep(0, result=None)
             
-            # Generate micro-lesson
-            micro_lesson = await self.use_tool(
-                "generate_micro_lesson",
-                {
-                    "context": coaching_context,
-                    "mood_analysis": mood_analysis,
-                    "workout_summary": workout_summary,
-                    "user_history": user_history,
-                    "duration_seconds": 60
-                },
-                context
-            )
-            
-            # Generate breathing guide
-            breathing_guide = await self.use_tool(
-                "generate_breathing_guide",
-                {
-                    "context": coaching_context,
-                    "duration_seconds": 60
-                },
-                context
+            mood_analysis, breathing_guide = await asyncio.gather(
+                mood_coro,
+                self.use_tool(
+                    "generate_breathing_guide",
+                    {
+                        "context": coaching_context,
+                        "duration_seconds": 60
+                    },
+                    context
+                )
             )
             
-            # Create journaling prompt
-            journal_prompt = await self.use_tool(
-                "create_journal_prompt",
-                {
-                    "context": coaching_context,
-                    "workout_summary": workout_summary,
-                    "mood_analysis": mood_analysis
-                },
-                context
+            # Phase 2: micro-lesson and journal prompt both depend on mood analysis
+            micro_lesson, journal_prompt = await asyncio.gather(
+                self.use_tool(
+                    "generate_micro_lesson",
+                    {
+                        "context": coaching_context,
+                        "mood_analysis": mood_analysis,
+                        "workout_summary": workout_summary,
+                        "user_history": user_history,
+                        "duration_seconds": 60
+                    },
+                    context
+                ),
+                self.use_tool(
+                    "create_journal_prompt",
+                    {
+                        "context": coaching_context,
+                        "workout_summary": workout_summary,
+                        "mood_analysis": mood_analysis
+                    },
+                    context
+                )
             )
             
             return {
@@ -124,17 +138,15 @@ class MindfulnessAgent(BaseAgent):
                 "journal_prompt": journal_prompt,
                 "mood_analysis": mood_analysis,
                 "context": coaching_context,
-                "timestamp": context.timestamp.isoformat()
+                "timestamp": context.timestamp_iso
             }
             
         except Exception as e:
-            logger.error(f"Error in mindfulness agent execution: {str(e)}", exc_info=True)
+            logger.error(
+                "Error in mindfulness agent execution: %s", e,
+                exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
             return {
                 "success": False,
                 "error": str(e)
             }
-    
-    def get_tools_used(self) -> List[str]:
-        """Return tools used in execution"""
-        return ["generate_micro_lesson", "create_journal_prompt", "analyze_mood", "generate_breathing_guide"]
-
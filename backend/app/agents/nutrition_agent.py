@@ -5,7 +5,8 @@ Classifies food images, estimates portions, and calculates
 nutritional information (calories, macros).
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Tuple
+import asyncio
 import logging
 
 from .base import BaseAgent
@@ -25,26 +26,34 @@ class NutritionAgent(BaseAgent):
     Agent responsible for food classification and nutrition estimation.
     """
     
+    TOOLS_USED = ("classify_food", "estimate_portion", "calculate_nutrition", "suggest_improvements")
+    
+    # Food classification model, loaded lazily on first execution
+    MODEL_NAME = "efficientnet_b0"
+    
     def __init__(self):
-        tools = [
-            ClassifyFoodTool(),
-            EstimatePortionTool(),
-            CalculateNutritionTool(),
-            SuggestImprovementsTool()
-        ]
         super().__init__(
             name="nutrition",
             description="Food classification and nutrition estimation",
-            tools=tools
+            tool_factories={
+                "classify_food": ClassifyFoodTool.get,
+                "estimate_portion": EstimatePortionTool.get,
+                "calculate_nutrition": CalculateNutritionTool.get,
+                "suggest_improvements": SuggestImprovementsTool.get
+            }
         )
         self.food_model = None
         
     async def _initialize(self) -> None:
-        """Initialize food classification model"""
+        """Nothing to do eagerly; the food model is loaded on first use"""
+    
+    async def _load_food_model(self) -> Any:
+        """Load food classification model"""
         logger.info("Initializing food classification model...")
         # In production, load EfficientNet or FoodNet model here
-        self.food_model = "efficientnet_b0"  # Placeholder
+        model = self.MODEL_NAME  # Placeholder
         logger.info("Food classification model initialized")
+        return model
     
     async def execute(
         self,
@@ -67,13 +76,15 @@ class NutritionAgent(BaseAgent):
         mode = task.get("mode", "estimate")
         user_hints = task.get("user_hints", {})
         
-        if not image:
+        if image is None or len(image) == 0:
             return {
                 "error": "No image provided",
                 "success": False
             }
         
         try:
+            self.food_model = await self.load_model(self.MODEL_NAME, self._load_food_model)
+            
             # Classify food
             classification = await self.use_tool(
                 "classify_food",
@@ -92,36 +103,23 @@ class NutritionAgent(BaseAgent):
                     "mode": "classify_only"
                 }
             
-            # Estimate portion size
-            portion_estimate = await self.use_tool(
-                "estimate_portion",
-                {
-                    "image": image,
-                    "food_class": classification.get("top_class"),
-                    "user_hints": user_hints
-                },
-                context
-            )
-            
-            # Calculate nutrition
-            nutrition = await self.use_tool(
-                "calculate_nutrition",
-                {
-                    "food_class": classification.get("top_class"),
-                    "portion_grams": portion_estimate.get("portion_grams"),
-                    "confidence": classification.get("confidence", 0.5)
-                },
-                context
-            )
+            food_class = classification.get("top_class")
             
-            # Suggest improvements
-            suggestions = await self.use_tool(
-                "suggest_improvements",
-                {
-                    "food_class": classification.get("top_class"),
-                    "current_nutrition": nutrition
-                },
-                context
+            # Portion -> nutrition is the only true dependency chain; suggestions
+            # are keyed on the food class alone and can run alongside it
+            (portion_estimate, nutrition), suggestions = await asyncio.gather(
+                self._estimate_nutrition(
+                    image,
+                    food_class,
+                    classification.get("confidence", 0.5),
+                    user_hints,
+                    context
+                ),
+                self.use_tool(
+                    "suggest_improvements",
+                    {"food_class": food_class},
+                    context
+                )
             )
             
             return {
@@ -134,13 +132,42 @@ class NutritionAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error in nutrition agent execution: {str(e)}", exc_info=True)
+            logger.error(
+                "Error in nutrition agent execution: %s", e,
+                exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    def get_tools_used(self) -> List[str]:
-        """Return tools used in execution"""
-        return ["classify_food", "estimate_portion", "calculate_nutrition", "suggest_improvements"]
-
+    async def _estimate_nutrition(
+        self,
+        image: Any,
+        food_class: str,
+        confidence: float,
+        user_hints: Dict[str, Any],
+        context: OrchestrationContext
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Estimate portion size, then calculate nutrition for that portion"""
+        portion_estimate = await self.use_tool(
+            "estimate_portion",
+            {
+                "image": image,
+                "food_class": food_class,
+                "user_hints": user_hints
+            },
+            context
+        )
+        
+        nutrition = await self.use_tool(
+            "calculate_nutrition",
+            {
+                "food_class": food_class,
+                "portion_grams": portion_estimate.get("portion_grams"),
+                "confidence": confidence
+            },
+            context
+        )
+        
+        return portion_estimate, nutrition
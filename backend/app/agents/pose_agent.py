@@ -5,7 +5,8 @@ Analyzes exercise form in real-time using pose estimation models,
 detects form errors, counts reps, and provides corrective feedback.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any
+import asyncio
 import logging
 import numpy as np
 
@@ -17,6 +18,7 @@ from ..tools.pose_tools import (
     CountRepsTool,
     CalculateFormScoreTool
 )
+from ..tools.pose_kernels import warm_up_kernels
 
 logger = logging.getLogger(__name__)
 
@@ -26,30 +28,36 @@ class PoseAgent(BaseAgent):
     Agent responsible for real-time pose analysis and form correction.
     """
     
+    TOOLS_USED = ("analyze_pose", "detect_form_errors", "count_reps", "calculate_form_score")
+    
+    # Pose estimation model, loaded lazily on first execution
+    MODEL_NAME = "mediapipe"
+    
     def __init__(self):
-        tools = [
-            AnalyzePoseTool(),
-            DetectFormErrorsTool(),
-            CountRepsTool(),
-            CalculateFormScoreTool()
-        ]
         super().__init__(
             name="pose",
             description="Real-time exercise form analysis and correction",
-            tools=tools
+            tool_factories={
+                "analyze_pose": AnalyzePoseTool.get,
+                "detect_form_errors": DetectFormErrorsTool.get,
+                "count_reps": CountRepsTool.get,
+                "calculate_form_score": CalculateFormScoreTool.get
+            }
         )
         self.pose_model = None
-        self.current_exercise = None
-        self.rep_count = 0
-        self.frame_buffer = []
         
     async def _initialize(self) -> None:
-        """Initialize pose estimation model"""
+        """Compile the pose kernels; the pose model is loaded on first use"""
+        await asyncio.get_running_loop().run_in_executor(None, warm_up_kernels)
+    
+    async def _load_pose_model(self) -> Any:
+        """Load pose estimation model"""
         # In production, load MediaPipe or MoveNet model here
         # For MVP, we'll use a mock initialization
         logger.info("Initializing pose estimation model...")
-        self.pose_model = "mediapipe"  # Placeholder
+        model = self.MODEL_NAME  # Placeholder
         logger.info("Pose model initialized")
+        return model
     
     async def execute(
         self,
@@ -72,8 +80,6 @@ class PoseAgent(BaseAgent):
         exercise_type = task.get("exercise_type", "squat")
         mode = task.get("mode", "real_time")
         
-        self.current_exercise = exercise_type
-        
         if not frames:
             return {
                 "error": "No frames provided",
@@ -81,62 +87,69 @@ class PoseAgent(BaseAgent):
             }
         
         try:
-            # Analyze pose for all frames
-            keypoints_list = []
-            for frame in frames:
-                keypoints = await self.use_tool(
-                    "analyze_pose",
-                    {"frame": frame, "model": self.pose_model},
-                    context
-                )
-                keypoints_list.append(keypoints)
+            self.pose_model = await self.load_model(self.MODEL_NAME, self._load_pose_model)
             
-            # Detect form errors
-            form_errors = await self.use_tool(
-                "detect_form_errors",
-                {
-                    "keypoints_list": keypoints_list,
-                    "exercise_type": exercise_type
-                },
+            # Analyze pose for all frames in a single batched call
+            pose_batch = await self.use_tool(
+                "analyze_pose",
+                {"frames": frames, "model": self.pose_model},
                 context
             )
+            keypoints = pose_batch["keypoints"]
             
-            # Count reps
-            rep_data = await self.use_tool(
-                "count_reps",
-                {
-                    "keypoints_list": keypoints_list,
-                    "exercise_type": exercise_type
-                },
-                context
+            # Form error detection and rep counting are independent
+            form_errors, rep_data = await asyncio.gather(
+                self.use_tool(
+                    "detect_form_errors",
+                    {
+                        "keypoints": keypoints,
+                        "exercise_type": exercise_type
+                    },
+                    context
+                ),
+                self.use_tool(
+                    "count_reps",
+                    {
+                        "keypoints": keypoints,
+                        "exercise_type": exercise_type
+                    },
+                    context
+                )
             )
             
-            self.rep_count = rep_data.get("rep_count", 0)
+            rep_count = rep_data.get("rep_count", 0)
+            
+            # Per-session state lives on the context so one agent can serve
+            # concurrent sessions
+            pose_state = context.metadata.setdefault("pose", {})
+            pose_state["current_exercise"] = exercise_type
+            pose_state["rep_count"] = rep_count
             
             # Calculate overall form score
             form_score = await self.use_tool(
                 "calculate_form_score",
                 {
                     "form_errors": form_errors,
-                    "rep_count": self.rep_count,
+                    "rep_count": rep_count,
                     "exercise_type": exercise_type
                 },
                 context
             )
             
             # Determine if workout is complete (e.g., 3 sets done)
-            workout_complete = self.rep_count >= 30  # Example threshold
+            workout_complete = rep_count >= 30  # Example threshold
             
             return {
                 "success": True,
                 "exercise_type": exercise_type,
-                "keypoints": keypoints_list,
+                "keypoints": keypoints.tolist(),
+                "joint_names": list(pose_batch["joint_names"]),
                 "form_errors": form_errors,
-                "rep_count": self.rep_count,
+                "rep_count": rep_count,
                 "form_score": form_score,
                 "workout_complete": workout_complete,
                 "summary": {
-                    "total_reps": self.rep_count,
+                    "total_reps": rep_count,
                     "form_score": form_score.get("overall_score", 0),
                     "top_errors": form_errors.get("top_errors", [])[:3],
                     "recommendations": form_errors.get("recommendations", [])
@@ -144,13 +157,11 @@ class PoseAgent(BaseAgent):
             }
             
         except Exception as e:
-            logger.error(f"Error in pose agent execution: {str(e)}", exc_info=True)
+            logger.error(
+                "Error in pose agent execution: %s", e,
+                exc_info=logger.isEnabledFor(logging.DEBUG)
+            )
             return {
                 "success": False,
                 "error": str(e)
             }
-    
-    def get_tools_used(self) -> List[str]:
-        """Return tools used in execution"""
-        return ["analyze_pose", "detect_form_errors", "count_reps", "calculate_form_score"]
-
@@ -5,17 +5,88 @@ Validates agent inputs and outputs to ensure safety, prevent harmful content,
 and enforce compliance with medical disclaimers.
 """
 
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
+from typing import Dict, Any, ClassVar, Iterable, Iterator, List, Optional, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass, replace
 import re
 import logging
 
 from ..orchestration.context import OrchestrationContext
 
+try:
+    # google-re2: linear-time (DFA) matching for the sanitize hot path
+    import re2
+except ImportError:
+    re2 = None
+
 logger = logging.getLogger(__name__)
 
+# Sentence boundaries used when stripping flagged sentences from text
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+
+
+def _compile_keywords(keywords: List[str]) -> re.Pattern:
+    """
+    Compile a keyword list into a single case-insensitive alternation.
+    
+    Each keyword gets a named group ``k<index>`` so the configured keyword can
+    be recovered from a match without lowercasing the matched text.
+    """
+    # Longest first so overlapping keywords report the most specific match
+    ordered = sorted(enumerate(keywords), key=lambda item: len(item[1]), reverse=True)
+    return re.compile(
+        "|".join(f"(?P<k{i}>{re.escape(k)})" for i, k in ordered),
+        re.IGNORECASE
+    )
+
 
-@dataclass
+def _compile_scanner(keywords: List[str]) -> Any:
+    """
+    Compile a keyword list into a case-insensitive matcher for match positions.
+    
+    Uses RE2 when google-re2 is installed and falls back to ``re`` otherwise.
+    Unlike _compile_keywords, matches carry no group names.
+    """
+    ordered = sorted(keywords, key=len, reverse=True)
+    pattern = "(?i)(?:" + "|".join(re.escape(k) for k in ordered) + ")"
+    if re2 is not None:
+        return re2.compile(pattern)
+    return re.compile(pattern)
+
+
+def _matched_keyword(match: re.Match, keywords: List[str]) -> str:
+    """Return the configured keyword that produced a match"""
+    return keywords[int(match.lastgroup[1:])]
+
+
+# Payload keys holding image/frame/keypoint data rather than user-facing text
+_BINARY_KEYS = frozenset({"image", "frames", "frame", "keypoints"})
+
+
+def _iter_text(obj: Any) -> Iterator[str]:
+    """
+    Yield the string leaves of a nested payload.
+    
+    Binary blobs, arrays, and known binary keys are skipped so guardrail
+    scans never stringify image or keypoint data.
+    """
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for key, value in obj.items():
+            if key not in _BINARY_KEYS:
+                yield from _iter_text(value)
+    elif isinstance(obj, (list, tuple)):
+        for item in obj:
+            yield from _iter_text(item)
+    elif is_dataclass(obj) and not isinstance(obj, type):
+        # Slotted result records such as pose FormError
+        for f in fields(obj):
+            if f.name not in _BINARY_KEYS:
+                yield from _iter_text(getattr(obj, f.name))
+
+
+@dataclass(slots=True)
 class GuardrailResult:
     """Result of guardrail validation"""
     allowed: bool
@@ -23,31 +94,116 @@ class GuardrailResult:
     sanitized_data: Optional[Dict[str, Any]] = None
 
 
+@dataclass(slots=True)
+class ScanReport:
+    """First keyword hit per category across all text in a payload"""
+    dangerous_keyword: Optional[str] = None
+    self_harm_keyword: Optional[str] = None
+    medical_keyword: Optional[str] = None
+    texts_scanned: int = 0
+
+
+# Key and size of the per-session cache of text scan results
+_SCAN_CACHE_KEY = "guardrail_scan"
+_SCAN_CACHE_SIZE = 512
+
+
+# Default keyword lists
+DEFAULT_MEDICAL_KEYWORDS = (
+    "diagnose", "diagnosis", "prescribe", "prescription", "treatment",
+    "cure", "disease", "illness", "symptom", "medical condition",
+    "see a doctor", "consult a physician", "medical professional"
+)
+DEFAULT_SELF_HARM_KEYWORDS = (
+    "suicide", "self-harm", "hurt yourself", "end your life"
+)
+DEFAULT_DANGEROUS_EXERCISE_KEYWORDS = (
+    "ignore pain", "push through injury", "ignore doctor", "ignore medical advice"
+)
+
+
 class GuardrailValidator:
     """
     Validates agent inputs and outputs against safety rules and compliance requirements.
+    
+    Use GuardrailValidator.instance() to share one validator (and its compiled
+    patterns) per keyword configuration instead of rebuilding it per request.
     """
     
-    def __init__(self):
+    # Shared validators keyed by (medical, self_harm, dangerous) keyword tuples
+    _instances: ClassVar[Dict[Tuple[Tuple[str, ...], ...], "GuardrailValidator"]] = {}
+    
+    def __init__(
+        self,
+        medical_keywords: Optional[Iterable[str]] = None,
+        self_harm_keywords: Optional[Iterable[str]] = None,
+        dangerous_exercise_keywords: Optional[Iterable[str]] = None
+    ):
         # Medical advice keywords to block
-        self.medical_keywords = [
-            "diagnose", "diagnosis", "prescribe", "prescription", "treatment",
-            "cure", "disease", "illness", "symptom", "medical condition",
-            "see a doctor", "consult a physician", "medical professional"
-        ]
+        self.medical_keywords = list(medical_keywords or DEFAULT_MEDICAL_KEYWORDS)
         
         # Self-harm keywords
-        self.self_harm_keywords = [
-            "suicide", "self-harm", "hurt yourself", "end your life"
-        ]
+        self.self_harm_keywords = list(self_harm_keywords or DEFAULT_SELF_HARM_KEYWORDS)
         
         # Dangerous exercise keywords
-        self.dangerous_exercise_keywords = [
-            "ignore pain", "push through injury", "ignore doctor", "ignore medical advice"
-        ]
+        self.dangerous_exercise_keywords = list(
+            dangerous_exercise_keywords or DEFAULT_DANGEROUS_EXERCISE_KEYWORDS
+        )
+        
+        # Scan results depend on the keyword lists, so validators with different
+        # keywords keep separate caches on a shared context
+        self._scan_cache_id = (
+            tuple(self.medical_keywords),
+            tuple(self.self_harm_keywords),
+            tuple(self.dangerous_exercise_keywords),
+        )
         
         # Disclaimer text
         self.disclaimer = "This is for educational purposes only and not medical advice."
+        
+        # Compile each keyword list once so every check is a single scan
+        self._medical_re = _compile_keywords(self.medical_keywords)
+        self._self_harm_re = _compile_keywords(self.self_harm_keywords)
+        self._dangerous_re = _compile_keywords(self.dangerous_exercise_keywords)
+        self._disclaimer_re = re.compile(re.escape(self.disclaimer), re.IGNORECASE)
+        
+        # sanitize_text finds all medical hits in one pass over the whole text.
+        # That is only equivalent to a per-sentence search when no keyword
+        # contains a sentence boundary.
+        self._medical_scanner = _compile_scanner(self.medical_keywords)
+        self._scan_whole_text = not any(
+            _SENTENCE_SPLIT_RE.search(k) for k in self.medical_keywords
+        )
+        
+        # Output fields that carry user-facing text, per agent. Agents not
+        # listed here have their whole output scanned.
+        self.output_text_fields: Dict[str, Tuple[str, ...]] = {
+            "pose": ("form_errors", "summary"),
+            "nutrition": ("suggestions",),
+        }
+    
+    @classmethod
+    def instance(
+        cls,
+        medical_keywords: Optional[Iterable[str]] = None,
+        self_harm_keywords: Optional[Iterable[str]] = None,
+        dangerous_exercise_keywords: Optional[Iterable[str]] = None
+    ) -> "GuardrailValidator":
+        """
+        Get the shared validator for a keyword configuration.
+        
+        Patterns are compiled once per distinct configuration; later calls
+        with the same keywords return the cached validator.
+        """
+        key = (
+            tuple(medical_keywords or DEFAULT_MEDICAL_KEYWORDS),
+            tuple(self_harm_keywords or DEFAULT_SELF_HARM_KEYWORDS),
+            tuple(dangerous_exercise_keywords or DEFAULT_DANGEROUS_EXERCISE_KEYWORDS),
+        )
+        validator = cls._instances.get(key)
+        if validator is None:
+            validator = cls._instances[key] = cls(*key)
+        return validator
     
     async def validate(
         self,
@@ -66,23 +222,21 @@ class GuardrailValidator:
         Returns:
             GuardrailResult indicating if execution is allowed
         """
-        # Check for dangerous exercise advice
-        task_str = str(task).lower()
+        report = self.scan(task, context)
         
-        for keyword in self.dangerous_exercise_keywords:
-            if keyword in task_str:
-                return GuardrailResult(
-                    allowed=False,
-                    reason=f"Dangerous exercise advice detected: {keyword}"
-                )
+        # Check for dangerous exercise advice
+        if report.dangerous_keyword:
+            return GuardrailResult(
+                allowed=False,
+                reason=f"Dangerous exercise advice detected: {report.dangerous_keyword}"
+            )
         
         # Check for self-harm content
-        for keyword in self.self_harm_keywords:
-            if keyword in task_str:
-                return GuardrailResult(
-                    allowed=False,
-                    reason=f"Self-harm content detected: {keyword}"
-                )
+        if report.self_harm_keyword:
+            return GuardrailResult(
+                allowed=False,
+                reason=f"Self-harm content detected: {report.self_harm_keyword}"
+            )
         
         # Rate limiting check (simple implementation)
         if self._check_rate_limit(context):
@@ -110,16 +264,16 @@ class GuardrailValidator:
         Returns:
             GuardrailResult with sanitized data if needed
         """
-        output_str = str(output).lower()
+        # Only scan the text-bearing fields for agents whose outputs are
+        # dominated by numeric payloads (keypoints, nutrition tables)
+        text_fields = self.output_text_fields.get(agent)
+        if text_fields is None:
+            report = self.scan(output, context)
+        else:
+            report = self.scan([output.get(f) for f in text_fields], context)
         
         # Check for medical advice
-        medical_advice_found = False
-        for keyword in self.medical_keywords:
-            if keyword in output_str:
-                medical_advice_found = True
-                break
-        
-        if medical_advice_found:
+        if report.medical_keyword:
             logger.warning(f"Medical advice detected in {agent} output")
             sanitized = self.sanitize_output(output, remove_medical=True)
             return GuardrailResult(
@@ -129,16 +283,15 @@ class GuardrailValidator:
             )
         
         # Check for self-harm content
-        for keyword in self.self_harm_keywords:
-            if keyword in output_str:
-                return GuardrailResult(
-                    allowed=False,
-                    reason=f"Self-harm content in output: {keyword}"
-                )
+        if report.self_harm_keyword:
+            return GuardrailResult(
+                allowed=False,
+                reason=f"Self-harm content in output: {report.self_harm_keyword}"
+            )
         
         # Ensure disclaimer is present for mindfulness agent
         if agent == "mindfulness" and "text" in output:
-            if self.disclaimer.lower() not in str(output.get("text", "")).lower():
+            if not self._disclaimer_re.search(str(output.get("text", ""))):
                 # Add disclaimer
                 sanitized = output.copy()
                 if "micro_lesson" in sanitized:
@@ -151,6 +304,68 @@ class GuardrailValidator:
         
         return GuardrailResult(allowed=True)
     
+    def scan(
+        self,
+        payload: Any,
+        context: Optional[OrchestrationContext] = None
+    ) -> ScanReport:
+        """
+        Scan every text field of a payload against all keyword categories.
+        
+        Per-string results are cached on the context (separately per keyword
+        configuration), so text that reappears across calls in a session (task
+        fields echoed in the output, memory history merged into tasks) is only
+        scanned once.
+        
+        Args:
+            payload: Task or output payload
+            context: Optional orchestration context holding the scan cache
+            
+        Returns:
+            ScanReport with the first keyword hit in each category
+        """
+        cache = None
+        if context is not None:
+            caches = context.cache.get(_SCAN_CACHE_KEY)
+            if caches is None:
+                caches = context.cache[_SCAN_CACHE_KEY] = {}
+            cache = caches.get(self._scan_cache_id)
+            if cache is None:
+                cache = caches[self._scan_cache_id] = OrderedDict()
+        
+        report = ScanReport()
+        for text in _iter_text(payload):
+            report.texts_scanned += 1
+            
+            hits = cache.get(text) if cache is not None else None
+            if hits is None:
+                hits = self._scan_text(text)
+                if cache is not None:
+                    cache[text] = hits
+                    if len(cache) > _SCAN_CACHE_SIZE:
+                        cache.popitem(last=False)
+            elif cache is not None:
+                cache.move_to_end(text)
+            
+            dangerous, self_harm, medical = hits
+            report.dangerous_keyword = report.dangerous_keyword or dangerous
+            report.self_harm_keyword = report.self_harm_keyword or self_harm
+            report.medical_keyword = report.medical_keyword or medical
+        
+        return report
+    
+    def _scan_text(self, text: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        """Return the (dangerous, self-harm, medical) keyword hits for one string"""
+        hits = []
+        for pattern, keywords in (
+            (self._dangerous_re, self.dangerous_exercise_keywords),
+            (self._self_harm_re, self.self_harm_keywords),
+            (self._medical_re, self.medical_keywords),
+        ):
+            match = pattern.search(text)
+            hits.append(_matched_keyword(match, keywords) if match else None)
+        return tuple(hits)
+    
     def sanitize_text(self, text: str) -> str:
         """
         Sanitize text by removing flagged content.
@@ -161,18 +376,31 @@ class GuardrailValidator:
         Returns:
             Sanitized text
         """
-        sanitized = text
-        
-        # Remove medical advice patterns
-        for keyword in self.medical_keywords:
-            # Remove sentences containing medical keywords
-            sentences = re.split(r'[.!?]+', sanitized)
+        if not self._scan_whole_text:
+            # Drop every sentence containing a medical keyword
+            sentences = _SENTENCE_SPLIT_RE.split(text)
             sanitized = '. '.join([
                 s for s in sentences
-                if keyword.lower() not in s.lower()
+                if not self._medical_re.search(s)
             ])
+            return sanitized.strip()
         
-        return sanitized.strip()
+        # Find every medical hit in one scan, then keep the sentences that
+        # contain none of them
+        hits = [m.start() for m in self._medical_scanner.finditer(text)]
+        kept = []
+        start = 0
+        hit_index = 0
+        boundaries = [(m.start(), m.end()) for m in _SENTENCE_SPLIT_RE.finditer(text)]
+        boundaries.append((len(text), len(text)))
+        for end, next_start in boundaries:
+            while hit_index < len(hits) and hits[hit_index] < start:
+                hit_index += 1
+            if hit_index == len(hits) or hits[hit_index] >= end:
+                kept.append(text[start:end])
+            start = next_start
+        
+        return '. '.join(kept).strip()
     
     def sanitize_output(
         self,
@@ -191,20 +419,34 @@ class GuardrailValidator:
         """
         sanitized = output.copy()
         
-        if remove_medical:
-            # Sanitize text fields
-            for key, value in sanitized.items():
+        if not remove_medical:
+            return sanitized
+        
+        # Walk the payload with an explicit stack; each container is copied
+        # once when first entered so the caller's output is never mutated.
+        # Binary fields (images, frames, keypoints) are left untouched.
+        stack = [sanitized]
+        while stack:
+            container = stack.pop()
+            items = container.items() if isinstance(container, dict) else enumerate(container)
+            for key, value in items:
+                if key in _BINARY_KEYS:
+                    continue
                 if isinstance(value, str):
-                    sanitized[key] = self.sanitize_text(value)
-                elif isinstance(value, dict):
-                    sanitized[key] = self.sanitize_output(value, remove_medical)
-                elif isinstance(value, list):
-                    sanitized[key] = [
-                        self.sanitize_output(item, remove_medical) if isinstance(item, dict)
-                        else self.sanitize_text(item) if isinstance(item, str)
-                        else item
-                        for item in value
-                    ]
+                    container[key] = self.sanitize_text(value)
+                elif isinstance(value, (dict, list)):
+                    child = value.copy()
+                    container[key] = child
+                    stack.append(child)
+                elif is_dataclass(value) and not isinstance(value, type):
+                    # Records may be frozen, so sanitized text goes into a copy
+                    changes = {
+                        f.name: self.sanitize_text(getattr(value, f.name))
+                        for f in fields(value)
+                        if isinstance(getattr(value, f.name), str)
+                    }
+                    if changes:
+                        container[key] = replace(value, **changes)
         
         return sanitized
     
@@ -221,7 +463,7 @@ class GuardrailValidator:
     
     def add_disclaimer(self, text: str) -> str:
         """Add disclaimer to text"""
-        if self.disclaimer.lower() not in text.lower():
+        if not self._disclaimer_re.search(text):
             return f"{text} {self.disclaimer}"
         return text
 
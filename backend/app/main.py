@@ -4,32 +4,62 @@ FastAPI Main Application
 Entry point for the MindBody Coach API with multi-agent orchestration.
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, WebSocket
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Literal, Tuple
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from itertools import groupby
+from operator import attrgetter
 import uvicorn
+import asyncio
+import binascii
 import logging
+import os
+import shutil
+import struct
+import tempfile
 import uuid
 import base64
 from io import BytesIO
 
-from .orchestration.engine import OrchestrationEngine, AgentRole
+import cv2
+import numpy as np
+import orjson
+
+from .orchestration.engine import (
+    OrchestrationEngine,
+    POSE_AGENT,
+    NUTRITION_AGENT,
+    MINDFULNESS_AGENT
+)
 from .agents.pose_agent import PoseAgent
 from .agents.nutrition_agent import NutritionAgent
 from .agents.mindfulness_agent import MindfulnessAgent
 from .guardrails.validator import GuardrailValidator
 from .memory.manager import MemoryManager
+from .memory.redis_backend import RedisMemoryBackend
 from .tools.registry import ToolRegistry
+from .tasks import celery_app, run_pose, run_nutrition
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Request limits
+MAX_FRAMES_PER_REQUEST = 32
+MAX_VIDEO_FRAMES = 30  # Frames sampled from an uploaded video
+MAX_REQUEST_BYTES = int(os.getenv("MAX_REQUEST_BYTES", str(32 * 1024 * 1024)))
+MAX_VIDEO_UPLOAD_BYTES = int(os.getenv("MAX_VIDEO_UPLOAD_BYTES", str(256 * 1024 * 1024)))
+
 # Initialize components
-guardrail_validator = GuardrailValidator()
-memory_manager = MemoryManager()
+guardrail_validator = GuardrailValidator.instance()
+# Share session history through Redis when running several workers
+redis_url = os.getenv("REDIS_URL")
+memory_manager = MemoryManager(
+    backend=RedisMemoryBackend(redis_url) if redis_url else None
+)
 tool_registry = ToolRegistry()
 
 # Initialize agents
@@ -49,12 +79,64 @@ async def lifespan(app: FastAPI):
     yield
     # Shutdown (if needed)
     logger.info("Shutting down...")
+    if memory_manager.backend is not None:
+        await memory_manager.backend.close()
 
 app = FastAPI(
     title="MindBody Strength Coach API",
     description="Multi-agent orchestration framework for health coaching",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
+)
+
+
+class BodySizeLimitMiddleware:
+    """
+    Reject HTTP request bodies larger than max_bytes with a 413.
+    
+    path_limits overrides the limit for specific paths, e.g. video uploads
+    that are legitimately larger than any frame batch.
+    """
+    
+    def __init__(self, app, max_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = path_limits or {}
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        max_bytes = self.path_limits.get(scope["path"], self.max_bytes)
+        
+        # Fast path: reject on the declared length before reading anything
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > max_bytes:
+            response = ORJSONResponse(status_code=413, content={"detail": "Request body too large"})
+            await response(scope, receive, send)
+            return
+        
+        # Streamed (chunked) bodies are counted as they arrive
+        received = 0
+        
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    raise HTTPException(status_code=413, detail="Request body too large")
+            return message
+        
+        await self.app(scope, limited_receive, send)
+
+
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=MAX_REQUEST_BYTES,
+    path_limits={"/api/v1/pose/analyze_video": MAX_VIDEO_UPLOAD_BYTES}
 )
 
 # CORS middleware
@@ -70,9 +152,9 @@ app.add_middleware(
 # Create orchestration engine
 orchestration_engine = OrchestrationEngine(
     agents={
-        AgentRole.POSE.value: pose_agent,
-        AgentRole.NUTRITION.value: nutrition_agent,
-        AgentRole.MINDFULNESS.value: mindfulness_agent,
+        POSE_AGENT: pose_agent,
+        NUTRITION_AGENT: nutrition_agent,
+        MINDFULNESS_AGENT: mindfulness_agent,
     },
     guardrail_validator=guardrail_validator,
     memory_manager=memory_manager,
@@ -81,11 +163,17 @@ orchestration_engine = OrchestrationEngine(
 
 
 # Request/Response Models
+# Mindfulness coaching attached to a workout session. post_workout coaching
+# uses the pose summary; the others run concurrently with pose analysis
+CoachingContext = Literal["post_workout", "pre_workout", "general"]
+
+
 class PoseRequest(BaseModel):
-    frames: List[str]  # Base64 encoded frames
+    frames: List[str] = Field(..., max_length=MAX_FRAMES_PER_REQUEST)  # Base64 encoded frames
     exercise_type: str
     session_id: Optional[str] = None
     user_id: Optional[str] = None
+    coaching_context: CoachingContext = "post_workout"
 
 
 class NutritionRequest(BaseModel):
@@ -103,6 +191,147 @@ class MindfulnessRequest(BaseModel):
     workout_summary: Optional[Dict[str, Any]] = None
 
 
+# Image decoding helpers
+
+def _decode_image_bytes(data: bytes) -> np.ndarray:
+    """Decode encoded image bytes (JPEG, PNG, ...) into a BGR uint8 array (blocking)."""
+    # cv2.imdecode raises cv2.error rather than returning None on an empty buffer
+    if not len(data):
+        raise ValueError("Empty image payload")
+    try:
+        image = cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+    except cv2.error as e:
+        raise ValueError(f"Could not decode image data: {e.msg}") from e
+    if image is None:
+        raise ValueError("Could not decode image data")
+    return image
+
+
+def _decode_b64_image_bytes(b64: str) -> np.ndarray:
+    """Decode a base64 encoded image into a BGR uint8 array (blocking)."""
+    try:
+        data = base64.b64decode(b64, validate=True)
+    except (binascii.Error, ValueError) as e:
+        raise ValueError(f"Invalid base64 image data: {e}") from e
+    return _decode_image_bytes(data)
+
+
+async def _decode_image(data: bytes) -> np.ndarray:
+    """
+    Decode raw encoded image bytes off the event loop.
+    
+    Args:
+        data: Encoded image bytes (JPEG, PNG, ...)
+        
+    Returns:
+        Decoded image as a contiguous BGR uint8 array
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _decode_image_bytes, data)
+
+
+async def _decode_b64_image(b64: str) -> np.ndarray:
+    """
+    Decode a base64 encoded image off the event loop.
+    
+    Args:
+        b64: Base64 encoded image (JPEG, PNG, ...)
+        
+    Returns:
+        Decoded image as a contiguous BGR uint8 array
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _decode_b64_image_bytes, b64)
+
+
+def _sample_video_frames(video_file, suffix: str, max_frames: int) -> List[np.ndarray]:
+    """
+    Sample frames evenly across an uploaded video (blocking).
+    
+    OpenCV can only open videos from a path, so the upload is streamed to a
+    temporary file first. Frames between samples are only grab()bed, which
+    advances the demuxer without decoding them.
+    
+    Args:
+        video_file: Binary file object holding the video
+        suffix: File extension hinting the container format
+        max_frames: Maximum number of frames to sample
+        
+    Returns:
+        Sampled BGR uint8 frames in clip order
+    """
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix)
+    tmp_path = tmp_file.name
+    cap = None
+    try:
+        # Remove the temp file even if the copy itself fails (disconnect, disk full)
+        with tmp_file:
+            shutil.copyfileobj(video_file, tmp_file, length=1024 * 1024)
+        
+        cap = cv2.VideoCapture(tmp_path)
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        step = max(1, total_frames // max_frames)
+        frames = []
+        
+        for frame_idx in range((max_frames - 1) * step + 1):
+            if not cap.grab():
+                break
+            if frame_idx % step == 0:
+                ret, frame = cap.retrieve()
+                if not ret:
+                    break
+                frames.append(frame)
+        
+        return frames
+    finally:
+        if cap is not None:
+            cap.release()
+        os.unlink(tmp_path)
+
+
+# Binary WebSocket frame protocol: a 16 byte little-endian header
+# (version, exercise id, user id length, frame sequence number, client
+# capture time in ms) followed by the UTF-8 user id and the raw JPEG bytes.
+WS_FRAME_HEADER = struct.Struct("<BBHIQ")
+WS_FRAME_VERSION = 1
+WS_EXERCISE_TYPES = (
+    "squat",
+    "pushup",
+    "bicep_curl",
+    "tricep_extension",
+    "chest_press",
+    "shoulder_press",
+    "lunge",
+    "plank",
+    "row",
+)
+
+
+def _parse_ws_frame(blob: bytes) -> Tuple[str, Optional[str], int, memoryview]:
+    """
+    Split a binary WebSocket message into its header fields and JPEG payload.
+    
+    Args:
+        blob: Raw binary message
+        
+    Returns:
+        Tuple of (exercise_type, user_id, sequence number, JPEG bytes)
+    """
+    if len(blob) < WS_FRAME_HEADER.size:
+        raise ValueError("Frame message shorter than header")
+    
+    version, exercise_id, user_id_len, sequence, _ = WS_FRAME_HEADER.unpack_from(blob)
+    if version != WS_FRAME_VERSION:
+        raise ValueError(f"Unsupported frame version: {version}")
+    if exercise_id >= len(WS_EXERCISE_TYPES):
+        raise ValueError(f"Unknown exercise id: {exercise_id}")
+    
+    view = memoryview(blob)
+    payload_start = WS_FRAME_HEADER.size + user_id_len
+    user_id = str(view[WS_FRAME_HEADER.size:payload_start], "utf-8") if user_id_len else None
+    return WS_EXERCISE_TYPES[exercise_id], user_id, sequence, view[payload_start:]
+
+
 # API Endpoints
 
 @app.get("/")
@@ -131,23 +360,115 @@ async def infer_pose(request: PoseRequest):
     try:
         session_id = request.session_id or str(uuid.uuid4())
         
-        # Decode frames (in production, handle actual frame data)
-        frames = request.frames  # Placeholder - decode base64 in production
+        # Decode all frames in parallel on the default thread pool
+        frames = await asyncio.gather(*[_decode_b64_image(f) for f in request.frames])
         
         result = await orchestration_engine.orchestrate_workout_session(
             session_id=session_id,
             frames=frames,
             exercise_type=request.exercise_type,
-            user_id=request.user_id
+            user_id=request.user_id,
+            coaching_context=request.coaching_context
+        )
+        
+        return ORJSONResponse(content=result)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in pose inference: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/api/v1/pose/infer/upload")
+async def infer_pose_upload(
+    files: List[UploadFile] = File(...),
+    exercise_type: str = Form(...),
+    session_id: Optional[str] = Form(None),
+    user_id: Optional[str] = Form(None),
+    coaching_context: CoachingContext = Form("post_workout")
+):
+    """
+    Analyze pose from frames uploaded as multipart JPEG/PNG files.
+    
+    Avoids the base64 inflation of /api/v1/pose/infer: each file is read as
+    raw bytes and decoded straight into an image array.
+    """
+    if len(files) > MAX_FRAMES_PER_REQUEST:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {MAX_FRAMES_PER_REQUEST} frames per request"
+        )
+    
+    async def read_frame(file: UploadFile) -> np.ndarray:
+        data = await file.read()
+        if not data:
+            raise ValueError(f"Empty upload: {file.filename}")
+        return await _decode_image(data)
+    
+    try:
+        session_id = session_id or str(uuid.uuid4())
+        frames = await asyncio.gather(*[read_frame(f) for f in files])
+        
+        result = await orchestration_engine.orchestrate_workout_session(
+            session_id=session_id,
+            frames=frames,
+            exercise_type=exercise_type,
+            user_id=user_id,
+            coaching_context=coaching_context
         )
         
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in pose inference: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/v1/pose/analyze_video")
+async def analyze_pose_video(
+    video: UploadFile = File(...),
+    exercise_type: str = Form(...),
+    session_id: Optional[str] = Form(None),
+    user_id: Optional[str] = Form(None),
+    coaching_context: CoachingContext = Form("post_workout")
+):
+    """
+    Analyze pose from an uploaded exercise video.
+    
+    Frames are sampled evenly across the clip on the server, so clients can
+    post the video as-is instead of decoding and encoding frames themselves.
+    """
+    try:
+        session_id = session_id or str(uuid.uuid4())
+        suffix = os.path.splitext(video.filename or "")[1] or ".mp4"
+        
+        loop = asyncio.get_running_loop()
+        frames = await loop.run_in_executor(
+            None, _sample_video_frames, video.file, suffix, MAX_VIDEO_FRAMES
+        )
+        if not frames:
+            raise ValueError("Could not extract frames from video")
+        
+        result = await orchestration_engine.orchestrate_workout_session(
+            session_id=session_id,
+            frames=frames,
+            exercise_type=exercise_type,
+            user_id=user_id,
+            coaching_context=coaching_context
+        )
+        
+        return ORJSONResponse(content=result)
+        
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error in video pose analysis: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.post("/api/v1/food/estimate")
 async def estimate_food(request: NutritionRequest):
     """
@@ -156,8 +477,7 @@ async def estimate_food(request: NutritionRequest):
     try:
         session_id = request.session_id or str(uuid.uuid4())
         
-        # Decode image (in production, handle actual image data)
-        image = request.image  # Placeholder - decode base64 in production
+        image = await _decode_b64_image(request.image)
         
         result = await orchestration_engine.orchestrate_nutrition_analysis(
             session_id=session_id,
@@ -165,13 +485,73 @@ async def estimate_food(request: NutritionRequest):
             user_id=request.user_id
         )
         
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
         
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         logger.error(f"Error in food estimation: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
+async def _enqueue(task: Any, payload: Dict[str, Any]) -> ORJSONResponse:
+    """Submit a background task and answer 202 with its id"""
+    task_id = str(uuid.uuid4())
+    try:
+        # Publishing talks to the broker synchronously; keep it off the loop
+        await asyncio.to_thread(task.apply_async, args=(payload,), task_id=task_id)
+    except Exception as e:
+        logger.error(f"Error enqueueing task: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=503, detail="Task queue unavailable")
+    
+    return ORJSONResponse(status_code=202, content={
+        "task_id": task_id,
+        "session_id": payload["session_id"],
+        "status_url": f"/api/v1/tasks/{task_id}"
+    })
+
+
+@app.post("/api/v1/pose/infer/async", status_code=202)
+async def submit_pose_inference(request: PoseRequest):
+    """
+    Queue pose analysis for a background worker and return a task id.
+    """
+    payload = request.model_dump()
+    payload["session_id"] = request.session_id or str(uuid.uuid4())
+    return await _enqueue(run_pose, payload)
+
+
+@app.post("/api/v1/food/estimate/async", status_code=202)
+async def submit_food_estimation(request: NutritionRequest):
+    """
+    Queue nutrition estimation for a background worker and return a task id.
+    """
+    payload = request.model_dump()
+    payload["session_id"] = request.session_id or str(uuid.uuid4())
+    return await _enqueue(run_nutrition, payload)
+
+
+@app.get("/api/v1/tasks/{task_id}")
+async def get_task_status(task_id: str):
+    """
+    Get the status, and once finished the result, of a background task.
+    """
+    def _status() -> Dict[str, Any]:
+        task = celery_app.AsyncResult(task_id)
+        status = {"task_id": task_id, "status": task.state}
+        if task.successful():
+            status["result"] = task.result
+        elif task.failed():
+            status["error"] = str(task.result)
+        return status
+    
+    try:
+        return ORJSONResponse(content=await asyncio.to_thread(_status))
+    except Exception as e:
+        logger.error(f"Error getting task status: {str(e)}", exc_info=True)
+        raise HTTPException(status_code=503, detail="Task backend unavailable")
+
+
 @app.post("/api/v1/mind/short")
 async def mindfulness_coaching(request: MindfulnessRequest):
     """
@@ -181,7 +561,7 @@ async def mindfulness_coaching(request: MindfulnessRequest):
         session_id = request.session_id or str(uuid.uuid4())
         
         response = await orchestration_engine.execute_agent(
-            agent_name=AgentRole.MINDFULNESS.value,
+            agent_name=MINDFULNESS_AGENT,
             task={
                 "context": request.context,
                 "mood_hint": request.mood_hint,
@@ -194,7 +574,7 @@ async def mindfulness_coaching(request: MindfulnessRequest):
         if not response.success:
             raise HTTPException(status_code=400, detail=response.error)
         
-        return JSONResponse(content=response.data)
+        return ORJSONResponse(content=response.data)
         
     except Exception as e:
         logger.error(f"Error in mindfulness coaching: {str(e)}", exc_info=True)
@@ -210,7 +590,7 @@ async def get_session_summary(session_id: str):
         summary = orchestration_engine.get_session_summary(session_id)
         memory_summary = memory_manager.get_session_summary(session_id)
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "orchestration": summary,
             "memory": memory_summary
         })
@@ -227,59 +607,155 @@ async def list_agents():
     for name, agent in orchestration_engine.agents.items():
         agents_info[name] = agent.get_state()
     
-    return JSONResponse(content=agents_info)
+    return ORJSONResponse(content=agents_info)
 
 
 @app.get("/api/v1/tools")
 async def list_tools():
     """List all available tools"""
     tools_info = tool_registry.list_all_tool_info()
-    return JSONResponse(content={"tools": tools_info})
+    return ORJSONResponse(content={"tools": tools_info})
 
 
 # WebSocket endpoint for real-time pose analysis
-@app.websocket("/ws/pose")
-async def websocket_pose(websocket: WebSocket):
-    """WebSocket endpoint for real-time pose analysis"""
-    await websocket.accept()
-    session_id = str(uuid.uuid4())
+# Frames arriving on a pose websocket are analyzed in mini-batches of up to
+# WS_BATCH_SIZE frames collected within WS_BATCH_WINDOW seconds
+WS_BATCH_SIZE = 8
+WS_BATCH_WINDOW = 0.033
+
+
+@dataclass(slots=True)
+class _QueuedFrame:
+    """A received websocket frame (or the error decoding it) awaiting analysis"""
+    sequence: Optional[int]
+    exercise_type: Optional[str] = None
+    user_id: Optional[str] = None
+    frame: Optional[np.ndarray] = None
+    error: Optional[str] = None
+
+
+# Consecutive frames sharing these fields are analyzed in one agent call
+_frame_group_key = attrgetter("error", "exercise_type", "user_id")
+
+
+async def _analyze_pose_batches(
+    websocket: WebSocket,
+    queue: "asyncio.Queue[_QueuedFrame]",
+    session_id: str
+) -> None:
+    """
+    Drain queued websocket frames in mini-batches and send one reply per batch.
     
-    try:
-        while True:
-            # Receive frame data
-            data = await websocket.receive_json()
-            frame = data.get("frame")
-            exercise_type = data.get("exercise_type", "squat")
+    Consecutive frames for the same exercise and user share a single
+    execute_agent call, amortizing guardrails and memory lookups. Replies are
+    sent in arrival order.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + WS_BATCH_WINDOW
+        while len(batch) < WS_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        for (error, exercise_type, user_id), group in groupby(batch, key=_frame_group_key):
+            items = list(group)
+            if error is not None:
+                for item in items:
+                    await websocket.send_text(orjson.dumps({
+                        "success": False,
+                        "error": item.error,
+                        "sequence": item.sequence,
+                        "session_id": session_id
+                    }).decode())
+                continue
             
-            # Process frame
             response = await orchestration_engine.execute_agent(
-                agent_name=AgentRole.POSE.value,
+                agent_name=POSE_AGENT,
                 task={
-                    "frames": [frame],
+                    "frames": [item.frame for item in items],
                     "exercise_type": exercise_type,
                     "mode": "real_time"
                 },
                 session_id=session_id,
-                user_id=data.get("user_id")
+                user_id=user_id
             )
             
-            # Send response
-            await websocket.send_json({
+            await websocket.send_text(orjson.dumps({
                 "success": response.success,
                 "data": response.data,
+                "sequence": items[-1].sequence,
+                "sequences": [item.sequence for item in items],
                 "session_id": session_id
-            })
+            }, option=orjson.OPT_SERIALIZE_NUMPY).decode())
+
+
+@app.websocket("/ws/pose")
+async def websocket_pose(websocket: WebSocket):
+    """WebSocket endpoint for real-time pose analysis"""
+    await websocket.accept()
+    session_id = str(uuid.uuid4())
+    queue: "asyncio.Queue[_QueuedFrame]" = asyncio.Queue()
+    analyzer = asyncio.create_task(_analyze_pose_batches(websocket, queue, session_id))
+    
+    try:
+        while True:
+            # Receive frame data: binary frames (see WS_FRAME_HEADER) or
+            # legacy JSON messages with a base64 encoded frame
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if analyzer.done():
+                # Surface failures from the analysis task
+                analyzer.result()
+            
+            sequence = None
+            try:
+                if message.get("bytes") is not None:
+                    exercise_type, user_id, sequence, payload = _parse_ws_frame(message["bytes"])
+                    frame = await _decode_image(payload)
+                else:
+                    data = orjson.loads(message["text"])
+                    if not isinstance(data, dict):
+                        raise ValueError("Frame message must be a JSON object")
+                    exercise_type = data.get("exercise_type", "squat")
+                    user_id = data.get("user_id")
+                    frame = await _decode_b64_image(data.get("frame") or "")
+            except (ValueError, cv2.error) as e:
+                # A malformed frame gets an error reply; the socket stays open
+                queue.put_nowait(_QueuedFrame(sequence=sequence, error=str(e)))
+                continue
+            
+            queue.put_nowait(_QueuedFrame(
+                sequence=sequence,
+                exercise_type=exercise_type,
+                user_id=user_id,
+                frame=frame
+            ))
             
     except Exception as e:
         logger.error(f"WebSocket error: {str(e)}", exc_info=True)
         await websocket.close()
+    finally:
+        analyzer.cancel()
 
 
 if __name__ == "__main__":
+    # Set API_WORKERS > 1 (together with REDIS_URL) to serve from several
+    # processes; auto-reload is only available with a single worker.
+    workers = int(os.getenv("API_WORKERS", "1"))
     uvicorn.run(
         "app.main:app",
         host="0.0.0.0",
         port=8000,
-        reload=True
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+        workers=workers,
+        reload=workers == 1
     )
-
@@ -5,16 +5,36 @@ Manages context and memory for agents, including session history,
 user preferences, and long-term patterns.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Deque, Dict, Any, List, Optional, Tuple, TYPE_CHECKING
+from collections import Counter, OrderedDict, deque
 from datetime import datetime, timedelta
 from dataclasses import dataclass, field
+from itertools import count, islice
 import json
 import logging
 
+if TYPE_CHECKING:
+    from .redis_backend import RedisMemoryBackend
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of memoized get_context results
+_CONTEXT_CACHE_SIZE = 1024
+
+# Task keys that are not kept in memory: raw media (decoded frames and images)
+# and the memory context merged into tasks by the orchestration engine
+SKIPPED_TASK_KEYS = frozenset({
+    "frames",
+    "frame",
+    "image",
+    "session_history",
+    "user_history",
+    "user_preferences",
+    "patterns"
+})
+
 
-@dataclass
+@dataclass(slots=True)
 class MemoryEntry:
     """Single memory entry"""
     session_id: str
@@ -24,6 +44,56 @@ class MemoryEntry:
     result: Dict[str, Any]
     timestamp: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    _serialized: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def as_dict(self) -> Dict[str, Any]:
+        """Context view of this entry, built once and shared by reference"""
+        if self._serialized is None:
+            self._serialized = {
+                "agent": self.agent,
+                "task": self.task,
+                "result": self.result,
+                "timestamp": self.timestamp.isoformat()
+            }
+        return self._serialized
+
+
+def _recent_entries(entries: Optional[Deque[MemoryEntry]], limit: int) -> List[MemoryEntry]:
+    """Return the last `limit` entries, oldest first"""
+    if not entries:
+        return []
+    recent = list(islice(reversed(entries), limit))
+    recent.reverse()
+    return recent
+
+
+def _append_by_agent(
+    index: Dict[str, Dict[str, Deque[MemoryEntry]]],
+    key: str,
+    entry: MemoryEntry
+) -> None:
+    """Append an entry to the per-agent deque of a session or user"""
+    by_agent = index.get(key)
+    if by_agent is None:
+        by_agent = index[key] = {}
+    entries = by_agent.get(entry.agent)
+    if entries is None:
+        entries = by_agent[entry.agent] = deque()
+    entries.append(entry)
+
+
+def _preference_item(entry: MemoryEntry) -> Optional[Tuple[str, str]]:
+    """Return the (aggregate, value) preference signal carried by an entry, if any"""
+    if entry.agent == "pose" and "exercise_type" in entry.task:
+        return "exercise_counts", entry.task["exercise_type"]
+    
+    if entry.agent == "mindfulness":
+        # mood_analysis is None when the request carried no mood hint
+        mood = (entry.result.get("mood_analysis") or {}).get("mood")
+        if mood:
+            return "moods", mood
+    
+    return None
 
 
 class MemoryManager:
@@ -35,14 +105,41 @@ class MemoryManager:
     - User-specific context
     - Long-term pattern recognition
     - Semantic search (with vector storage in production)
+    
+    With a shared backend (e.g. RedisMemoryBackend), session history is
+    written through to it and reloaded whenever another worker has appended
+    to the session, so multiple API workers can serve one session. User
+    history, preferences and patterns remain per worker.
     """
     
-    def __init__(self, max_session_memory: int = 1000):
+    def __init__(
+        self,
+        max_session_memory: int = 1000,
+        backend: Optional["RedisMemoryBackend"] = None
+    ):
         self.max_session_memory = max_session_memory
-        self.session_memory: Dict[str, List[MemoryEntry]] = {}
-        self.user_memory: Dict[str, List[MemoryEntry]] = {}
+        self.backend = backend
+        self._session_versions: Dict[str, int] = {}
+        self.max_user_memory = max_session_memory * 10
+        self.session_memory: Dict[str, Deque[MemoryEntry]] = {}
+        self.user_memory: Dict[str, Deque[MemoryEntry]] = {}
+        # Per-agent views of the same entries (trimmed in step with the deques
+        # above), so agent-filtered reads are O(limit)
+        self.session_by_agent: Dict[str, Dict[str, Deque[MemoryEntry]]] = {}
+        self.user_by_agent: Dict[str, Dict[str, Deque[MemoryEntry]]] = {}
+        self.user_aggregates: Dict[str, Dict[str, Counter]] = {}
         self.patterns: Dict[str, Any] = {}
         
+        # Memoized get_context results keyed by (session_id, user_id, agent, limit).
+        # Each result is stamped with the generations of the session, user and
+        # agent it was built from; storing an interaction bumps those generations.
+        # Generations come from one clock and are never reused, so clearing a
+        # session or user can drop its entry: a missing generation (0) only
+        # matches contexts that were built while it had no memory either.
+        self._ctx_cache: OrderedDict = OrderedDict()
+        self._generations: Dict[Tuple[str, Optional[str]], int] = {}
+        self._generation_clock = count(1)
+        
     async def store_interaction(
         self,
         session_id: str,
@@ -67,33 +164,51 @@ class MemoryManager:
             session_id=session_id,
             user_id=user_id,
             agent=agent,
-            task=task,
+            # Dropping media keeps the bounded deques from pinning image arrays
+            task={k: v for k, v in task.items() if k not in SKIPPED_TASK_KEYS},
             result=result,
             metadata=metadata or {}
         )
         
-        # Store in session memory
-        if session_id not in self.session_memory:
-            self.session_memory[session_id] = []
-        
-        self.session_memory[session_id].append(entry)
+        # Store in session memory (bounded deques drop the oldest entry in O(1))
+        session_entries = self.session_memory.get(session_id)
+        if session_entries is None:
+            session_entries = self.session_memory[session_id] = deque(maxlen=self.max_session_memory)
+        if len(session_entries) == session_entries.maxlen:
+            # The evicted entry is also the oldest one of its agent
+            self.session_by_agent[session_id][session_entries[0].agent].popleft()
+        session_entries.append(entry)
+        _append_by_agent(self.session_by_agent, session_id, entry)
         
-        # Limit session memory size
-        if len(self.session_memory[session_id]) > self.max_session_memory:
-            self.session_memory[session_id] = self.session_memory[session_id][-self.max_session_memory:]
+        if self.backend is not None:
+            version = await self.backend.append(entry)
+            # If another worker appended in between, force a reload on next read
+            known = self._session_versions.get(session_id, 0)
+            self._session_versions[session_id] = version if version == known + 1 else -1
         
         # Store in user memory if user_id provided
         if user_id:
-            if user_id not in self.user_memory:
-                self.user_memory[user_id] = []
-            self.user_memory[user_id].append(entry)
+            user_entries = self.user_memory.get(user_id)
+            if user_entries is None:
+                user_entries = self.user_memory[user_id] = deque(maxlen=self.max_user_memory)
             
-            # Limit user memory size
-            if len(self.user_memory[user_id]) > self.max_session_memory * 10:
-                self.user_memory[user_id] = self.user_memory[user_id][-self.max_session_memory * 10:]
+            # Keep preference aggregates in step with the retained history
+            if len(user_entries) == user_entries.maxlen:
+                evicted = user_entries[0]
+                self._count_preference(user_id, evicted, -1)
+                self.user_by_agent[user_id][evicted.agent].popleft()
+            user_entries.append(entry)
+            _append_by_agent(self.user_by_agent, user_id, entry)
+            self._count_preference(user_id, entry, 1)
         
         # Update patterns
         await self._update_patterns(entry)
+        
+        # Invalidate memoized contexts built from this session, user or agent
+        self._bump_generation("session", session_id)
+        self._bump_generation("agent", agent)
+        if user_id:
+            self._bump_generation("user", user_id)
     
     async def get_context(
         self,
@@ -112,8 +227,23 @@ class MemoryManager:
             limit: Maximum number of entries to return
             
         Returns:
-            Dictionary with relevant context
+            Dictionary with relevant context. The result may be shared with
+            other callers and must be treated as read-only.
         """
+        if self.backend is not None:
+            await self._sync_session(session_id)
+        
+        cache_key = (session_id, user_id, agent, limit)
+        stamp = (
+            self._generations.get(("session", session_id), 0),
+            self._generations.get(("user", user_id), 0) if user_id else 0,
+            self._generations.get(("agent", agent), 0) if agent else 0
+        )
+        cached = self._ctx_cache.get(cache_key)
+        if cached is not None and cached[0] == stamp:
+            self._ctx_cache.move_to_end(cache_key)
+            return cached[1]
+        
         context = {
             "session_history": [],
             "user_preferences": {},
@@ -122,68 +252,99 @@ class MemoryManager:
         
         # Get session history
         if session_id in self.session_memory:
-            entries = self.session_memory[session_id]
             if agent:
-                entries = [e for e in entries if e.agent == agent]
-            context["session_history"] = [
-                {
-                    "agent": e.agent,
-                    "task": e.task,
-                    "result": e.result,
-                    "timestamp": e.timestamp.isoformat()
-                }
-                for e in entries[-limit:]
-            ]
+                entries = self.session_by_agent.get(session_id, {}).get(agent)
+            else:
+                entries = self.session_memory[session_id]
+            context["session_history"] = [e.as_dict() for e in _recent_entries(entries, limit)]
         
         # Get user-specific context
         if user_id and user_id in self.user_memory:
-            user_entries = self.user_memory[user_id]
             if agent:
-                user_entries = [e for e in user_entries if e.agent == agent]
+                user_entries = self.user_by_agent.get(user_id, {}).get(agent)
+            else:
+                user_entries = self.user_memory[user_id]
             
             # Extract preferences from history
-            context["user_preferences"] = self._extract_preferences(user_entries)
+            context["user_preferences"] = self._extract_preferences(user_id, agent)
             
             # Get recent user history
-            context["user_history"] = [
-                {
-                    "agent": e.agent,
-                    "task": e.task,
-                    "result": e.result,
-                    "timestamp": e.timestamp.isoformat()
-                }
-                for e in user_entries[-limit:]
-            ]
+            context["user_history"] = [e.as_dict() for e in _recent_entries(user_entries, limit)]
         
         # Get relevant patterns
         if agent:
             context["patterns"] = self.patterns.get(agent, {})
         
+        self._ctx_cache[cache_key] = (stamp, context)
+        self._ctx_cache.move_to_end(cache_key)
+        if len(self._ctx_cache) > _CONTEXT_CACHE_SIZE:
+            self._ctx_cache.popitem(last=False)
+        
         return context
     
-    def _extract_preferences(self, entries: List[MemoryEntry]) -> Dict[str, Any]:
-        """Extract user preferences from memory entries"""
+    async def _sync_session(self, session_id: str) -> None:
+        """Reload a session's history from the shared backend if it changed elsewhere"""
+        if await self.backend.session_version(session_id) == self._session_versions.get(session_id, 0):
+            return
+        
+        version, entries = await self.backend.load_session(session_id)
+        session_entries = self.session_memory[session_id] = deque(entries, maxlen=self.max_session_memory)
+        self.session_by_agent.pop(session_id, None)
+        for entry in session_entries:
+            _append_by_agent(self.session_by_agent, session_id, entry)
+        self._session_versions[session_id] = version
+        self._bump_generation("session", session_id)
+    
+    def _bump_generation(self, kind: str, key: str) -> None:
+        """Mark memoized contexts depending on a session, user or agent as stale"""
+        generation_key = (kind, key)
+        self._generations[generation_key] = next(self._generation_clock)
+    
+    def _count_preference(self, user_id: str, entry: MemoryEntry, delta: int) -> None:
+        """Add (or remove, with a negative delta) an entry's preference signal"""
+        item = _preference_item(entry)
+        if item is None:
+            return
+        
+        aggregates = self.user_aggregates.get(user_id)
+        if aggregates is None:
+            aggregates = self.user_aggregates[user_id] = {
+                "exercise_counts": Counter(),
+                "moods": Counter()
+            }
+        
+        counts = aggregates[item[0]]
+        counts[item[1]] += delta
+        if counts[item[1]] <= 0:
+            del counts[item[1]]
+    
+    def _extract_preferences(self, user_id: str, agent: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract user preferences from the incrementally maintained aggregates.
+        
+        Args:
+            user_id: User identifier
+            agent: Optional agent name to restrict preferences to
+            
+        Returns:
+            Preferences, most frequent first
+        """
         preferences = {}
+        aggregates = self.user_aggregates.get(user_id)
+        if aggregates is None:
+            return preferences
         
         # Extract exercise preferences
-        exercise_types = []
-        for entry in entries:
-            if entry.agent == "pose" and "exercise_type" in entry.task:
-                exercise_types.append(entry.task["exercise_type"])
-        
-        if exercise_types:
-            preferences["favorite_exercises"] = list(set(exercise_types))
+        if agent in (None, "pose") and aggregates["exercise_counts"]:
+            preferences["favorite_exercises"] = [
+                exercise for exercise, _ in aggregates["exercise_counts"].most_common()
+            ]
         
         # Extract mood patterns
-        moods = []
-        for entry in entries:
-            if entry.agent == "mindfulness" and "mood_analysis" in entry.result:
-                mood = entry.result["mood_analysis"].get("mood")
-                if mood:
-                    moods.append(mood)
-        
-        if moods:
-            preferences["common_moods"] = list(set(moods))
+        if agent in (None, "mindfulness") and aggregates["moods"]:
+            preferences["common_moods"] = [
+                mood for mood, _ in aggregates["moods"].most_common()
+            ]
         
         return preferences
     
@@ -211,7 +372,7 @@ class MemoryManager:
             score = entry.result.get("form_score", {}).get("overall_score", 0)
             self.patterns[agent]["form_score_trend"].append({
                 "score": score,
-                "timestamp": entry.timestamp.isoformat()
+                "timestamp": entry.as_dict()["timestamp"]
             })
             
             # Keep only last 100 scores
@@ -242,17 +403,23 @@ class MemoryManager:
             "total_interactions": total_interactions,
             "agents_used": agents_used,
             "duration_seconds": duration,
-            "start_time": entries[0].timestamp.isoformat() if entries else None,
-            "end_time": entries[-1].timestamp.isoformat() if entries else None
+            "start_time": entries[0].as_dict()["timestamp"] if entries else None,
+            "end_time": entries[-1].as_dict()["timestamp"] if entries else None
         }
     
     def clear_session(self, session_id: str) -> None:
-        """Clear memory for a session"""
+        """Clear memory for a session (the shared backend copy is kept)"""
         if session_id in self.session_memory:
             del self.session_memory[session_id]
+        self.session_by_agent.pop(session_id, None)
+        self._session_versions.pop(session_id, None)
+        self._generations.pop(("session", session_id), None)
     
     def clear_user_memory(self, user_id: str) -> None:
         """Clear memory for a user"""
         if user_id in self.user_memory:
             del self.user_memory[user_id]
+        self.user_by_agent.pop(user_id, None)
+        self.user_aggregates.pop(user_id, None)
+        self._generations.pop(("user", user_id), None)
 
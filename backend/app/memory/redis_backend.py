@@ -0,0 +1,129 @@
+"""
+Redis Memory Backend
+
+Shares session history between API worker processes through Redis lists,
+so requests for one session can be served by any worker.
+"""
+
+from typing import Any, Dict, List, Tuple
+from datetime import datetime
+import logging
+
+import orjson
+
+from .manager import MemoryEntry, SKIPPED_TASK_KEYS
+
+logger = logging.getLogger(__name__)
+
+
+def _encode_entry(entry: MemoryEntry) -> bytes:
+    """Serialize a memory entry for storage in a Redis list"""
+    return orjson.dumps(
+        {
+            "session_id": entry.session_id,
+            "user_id": entry.user_id,
+            "agent": entry.agent,
+            "task": {k: v for k, v in entry.task.items() if k not in SKIPPED_TASK_KEYS},
+            "result": entry.result,
+            "timestamp": entry.as_dict()["timestamp"],
+            "metadata": entry.metadata
+        },
+        option=orjson.OPT_SERIALIZE_NUMPY,
+        default=str
+    )
+
+
+def _decode_entry(raw: bytes) -> MemoryEntry:
+    """Rebuild a memory entry from its Redis representation"""
+    data: Dict[str, Any] = orjson.loads(raw)
+    return MemoryEntry(
+        session_id=data["session_id"],
+        user_id=data["user_id"],
+        agent=data["agent"],
+        task=data["task"],
+        result=data["result"],
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        metadata=data["metadata"]
+    )
+
+
+class RedisMemoryBackend:
+    """
+    Redis-backed session history shared by all API workers.
+    
+    Each session is stored as a capped list (``sess:<id>``) plus a version
+    counter (``sess:<id>:version``) that is incremented on every append, so
+    workers can cheaply detect when their local copy is stale.
+    """
+    
+    def __init__(
+        self,
+        url: str,
+        max_session_memory: int = 1000,
+        max_connections: int = 20,
+        ttl_seconds: int = 24 * 60 * 60
+    ):
+        try:
+            import redis.asyncio as redis_async
+        except ImportError as e:
+            raise ImportError("RedisMemoryBackend requires the 'redis' package") from e
+        
+        self.max_session_memory = max_session_memory
+        self.ttl_seconds = ttl_seconds
+        self._pool = redis_async.ConnectionPool.from_url(url, max_connections=max_connections)
+        self._redis = redis_async.Redis(connection_pool=self._pool)
+    
+    @staticmethod
+    def _session_keys(session_id: str) -> Tuple[str, str]:
+        key = f"sess:{session_id}"
+        return key, f"{key}:version"
+    
+    async def append(self, entry: MemoryEntry) -> int:
+        """
+        Append an entry to its session history.
+        
+        Args:
+            entry: Memory entry to store
+        
+        Returns:
+            Session version after the append
+        """
+        key, version_key = self._session_keys(entry.session_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.rpush(key, _encode_entry(entry))
+        pipe.ltrim(key, -self.max_session_memory, -1)
+        pipe.incr(version_key)
+        pipe.expire(key, self.ttl_seconds)
+        pipe.expire(version_key, self.ttl_seconds)
+        results = await pipe.execute()
+        return int(results[2])
+    
+    async def session_version(self, session_id: str) -> int:
+        """Get the current version of a session's history (0 if unknown)"""
+        _, version_key = self._session_keys(session_id)
+        version = await self._redis.get(version_key)
+        return int(version) if version is not None else 0
+    
+    async def load_session(self, session_id: str) -> Tuple[int, List[MemoryEntry]]:
+        """
+        Load a session's history.
+        
+        Args:
+            session_id: Session identifier
+        
+        Returns:
+            Tuple of (session version, entries oldest first)
+        """
+        key, version_key = self._session_keys(session_id)
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.get(version_key)
+        pipe.lrange(key, 0, -1)
+        version, raw_entries = await pipe.execute()
+        return (
+            int(version) if version is not None else 0,
+            [_decode_entry(raw) for raw in raw_entries]
+        )
+    
+    async def close(self) -> None:
+        """Close the connection pool"""
+        await self._redis.aclose()
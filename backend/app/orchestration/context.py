@@ -4,20 +4,44 @@ Orchestration Context
 Context classes used across the orchestration system to avoid circular imports.
 """
 
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Dict, Any, List, Optional, TYPE_CHECKING
+from typing import Deque, Dict, Any, Optional, Set, Tuple, TYPE_CHECKING
 from datetime import datetime
+import time
 
 if TYPE_CHECKING:
     from .engine import AgentResponse
 
+# Most recent agent responses kept per session
+MAX_AGENT_HISTORY = 500
 
-@dataclass
+
+@dataclass(slots=True)
 class OrchestrationContext:
     """Context passed between agents"""
     session_id: str
     user_id: Optional[str] = None
     timestamp: datetime = field(default_factory=datetime.now)
     metadata: Dict[str, Any] = field(default_factory=dict)
-    agent_history: List[Any] = field(default_factory=list)  # List[AgentResponse] when available
+    agent_history: Deque[Any] = field(
+        default_factory=lambda: deque(maxlen=MAX_AGENT_HISTORY)
+    )  # Deque[AgentResponse] when available
+    agents_used: Set[str] = field(default_factory=set)  # Running aggregates over all executions
+    total_execution_time: float = 0.0
+    execution_count: int = 0
+    last_active: float = field(default_factory=time.monotonic, repr=False)  # time.monotonic() of last use
+    cache: Dict[str, Any] = field(default_factory=dict, repr=False)  # Per-session scratch space for derived data
+    _timestamp_iso: Optional[Tuple[datetime, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def timestamp_iso(self) -> str:
+        """ISO-formatted timestamp, formatted once and reused until timestamp changes"""
+        cached = self._timestamp_iso
+        if cached is None or cached[0] is not self.timestamp:
+            cached = (self.timestamp, self.timestamp.isoformat())
+            self._timestamp_iso = cached
+        return cached[1]
 
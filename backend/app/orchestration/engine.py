@@ -5,12 +5,14 @@ Coordinates multiple agents, manages tool execution, applies guardrails,
 and maintains context through the memory system.
 """
 
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
+from collections import ChainMap, OrderedDict
 from enum import Enum
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from datetime import datetime
 import asyncio
 import logging
+import time
 
 from .context import OrchestrationContext
 from ..agents.base import BaseAgent
@@ -29,7 +31,13 @@ class AgentRole(str, Enum):
     COORDINATOR = "coordinator"
 
 
-@dataclass
+# Agent names bound once for the per-request paths
+POSE_AGENT = AgentRole.POSE.value
+NUTRITION_AGENT = AgentRole.NUTRITION.value
+MINDFULNESS_AGENT = AgentRole.MINDFULNESS.value
+
+
+@dataclass(slots=True)
 class AgentResponse:
     """Response from an agent execution"""
     agent: str
@@ -37,12 +45,42 @@ class AgentResponse:
     data: Dict[str, Any]
     error: Optional[str] = None
     execution_time: float = 0.0
-    tools_used: List[str] = field(default_factory=list)
+    tools_used: Tuple[str, ...] = ()
 
 
 # OrchestrationContext moved to context.py to avoid circular imports
 
 
+async def _run_cancelling_on_error(coroutines: List[Any]) -> List["asyncio.Task"]:
+    """
+    Run coroutines concurrently; the first failure cancels the rest.
+    
+    Args:
+        coroutines: Coroutines to run
+        
+    Returns:
+        The finished (completed, failed or cancelled) tasks, in input order
+    """
+    if hasattr(asyncio, "TaskGroup"):  # Python 3.11+
+        tasks = []
+        try:
+            async with asyncio.TaskGroup() as group:
+                for coroutine in coroutines:
+                    tasks.append(group.create_task(coroutine))
+        except Exception:
+            pass  # Per-task outcomes are inspected by the caller
+        return tasks
+    
+    tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+    try:
+        await asyncio.gather(*tasks)
+    except Exception:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    return tasks
+
+
 class OrchestrationEngine:
     """
     Main orchestration engine that coordinates agents, tools, guardrails, and memory.
@@ -53,13 +91,19 @@ class OrchestrationEngine:
         agents: Dict[str, BaseAgent],
         guardrail_validator: GuardrailValidator,
         memory_manager: MemoryManager,
-        tool_registry: ToolRegistry
+        tool_registry: ToolRegistry,
+        max_sessions: int = 10_000,
+        session_ttl: float = 3600.0
     ):
         self.agents = agents
         self.guardrail_validator = guardrail_validator
         self.memory_manager = memory_manager
         self.tool_registry = tool_registry
-        self.active_sessions: Dict[str, OrchestrationContext] = {}
+        # Least recently used first; sessions idle for session_ttl seconds or
+        # beyond max_sessions are evicted on every session lookup
+        self.active_sessions: "OrderedDict[str, OrchestrationContext]" = OrderedDict()
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
         
     async def execute_agent(
         self,
@@ -80,7 +124,8 @@ class OrchestrationEngine:
         Returns:
             AgentResponse with execution results
         """
-        if agent_name not in self.agents:
+        agent = self.agents.get(agent_name)
+        if agent is None:
             return AgentResponse(
                 agent=agent_name,
                 success=False,
@@ -88,28 +133,28 @@ class OrchestrationEngine:
                 error=f"Agent {agent_name} not found"
             )
         
-        agent = self.agents[agent_name]
-        start_time = datetime.now()
+        memory_manager = self.memory_manager
+        guardrail_validator = self.guardrail_validator
+        start_time = time.monotonic()
         
         # Get or create session context
         context = self._get_or_create_context(session_id, user_id)
         
         try:
-            # Load relevant memory
-            memory_context = await self.memory_manager.get_context(
-                session_id=session_id,
-                user_id=user_id,
-                agent=agent_name
-            )
-            
-            # Merge memory context into task
-            enriched_task = {**task, **memory_context}
-            
-            # Apply guardrails before execution
-            guardrail_result = await self.guardrail_validator.validate(
-                agent=agent_name,
-                task=enriched_task,
-                context=context
+            # Load relevant memory and apply guardrails concurrently. Guardrails
+            # only need the incoming task: remembered interactions were already
+            # validated when they were produced.
+            memory_context, guardrail_result = await asyncio.gather(
+                memory_manager.get_context(
+                    session_id=session_id,
+                    user_id=user_id,
+                    agent=agent_name
+                ),
+                guardrail_validator.validate(
+                    agent=agent_name,
+                    task=task,
+                    context=context
+                )
             )
             
             if not guardrail_result.allowed:
@@ -120,11 +165,15 @@ class OrchestrationEngine:
                     error=f"Guardrail violation: {guardrail_result.reason}"
                 )
             
+            # Layer memory context under the task without copying either
+            # (agents only read from the task)
+            enriched_task = ChainMap(task, memory_context)
+            
             # Execute agent
             result = await agent.execute(enriched_task, context)
             
             # Validate output with guardrails
-            output_validation = await self.guardrail_validator.validate_output(
+            output_validation = await guardrail_validator.validate_output(
                 agent=agent_name,
                 output=result,
                 context=context
@@ -134,31 +183,34 @@ class OrchestrationEngine:
                 logger.warning(f"Output validation failed for {agent_name}: {output_validation.reason}")
                 result = await self._apply_output_sanitization(result, output_validation)
             
-            # Store in memory
-            await self.memory_manager.store_interaction(
+            # Store in memory (the memory manager drops media and memory context keys)
+            await memory_manager.store_interaction(
                 session_id=session_id,
                 user_id=user_id,
                 agent=agent_name,
-                task=enriched_task,
+                task=task,
                 result=result
             )
             
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.monotonic() - start_time
             
             response = AgentResponse(
                 agent=agent_name,
                 success=True,
                 data=result,
                 execution_time=execution_time,
-                tools_used=agent.get_tools_used() if hasattr(agent, 'get_tools_used') else []
+                tools_used=agent.get_tools_used()
             )
             
             context.agent_history.append(response)
+            context.agents_used.add(agent_name)
+            context.total_execution_time += execution_time
+            context.execution_count += 1
             return response
             
         except Exception as e:
             logger.error(f"Error executing agent {agent_name}: {str(e)}", exc_info=True)
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.monotonic() - start_time
             return AgentResponse(
                 agent=agent_name,
                 success=False,
@@ -187,17 +239,36 @@ class OrchestrationEngine:
             List of AgentResponse objects
         """
         if parallel:
-            # Execute all agents in parallel
+            # Execute all agents in parallel; an unexpected failure in one
+            # cancels the others instead of leaving them running
+            agent_names = [task['agent_name'] for task in tasks]
             coroutines = [
                 self.execute_agent(
-                    agent_name=task['agent_name'],
+                    agent_name=agent_name,
                     task=task.get('task', {}),
                     session_id=session_id,
                     user_id=user_id
                 )
-                for task in tasks
+                for agent_name, task in zip(agent_names, tasks)
             ]
-            return await asyncio.gather(*coroutines)
+            runs = await _run_cancelling_on_error(coroutines)
+            
+            responses = []
+            for agent_name, run in zip(agent_names, runs):
+                if run.cancelled():
+                    error = "Cancelled after another agent failed"
+                elif run.exception() is not None:
+                    error = str(run.exception())
+                else:
+                    responses.append(run.result())
+                    continue
+                responses.append(AgentResponse(
+                    agent=agent_name,
+                    success=False,
+                    data={},
+                    error=error
+                ))
+            return responses
         else:
             # Execute sequentially
             responses = []
@@ -216,23 +287,31 @@ class OrchestrationEngine:
         session_id: str,
         frames: List[Any],
         exercise_type: str,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        coaching_context: str = "post_workout"
     ) -> Dict[str, Any]:
         """
         Orchestrate a complete workout session with pose analysis and mindfulness.
         
+        Post-workout coaching depends on the pose summary, so it runs after pose
+        analysis and only once the workout is complete. Its preparation cannot
+        usefully overlap pose either: guardrails check the workout summary, and
+        the memory context is invalidated when the pose interaction is stored.
+        Any other coaching context (e.g. pre_workout) is independent of the
+        pose results and runs concurrently with pose analysis.
+        
         Args:
             session_id: Session identifier
             frames: Video frames for analysis
             exercise_type: Type of exercise (squat, pushup, etc.)
             user_id: Optional user identifier
+            coaching_context: Mindfulness context (post_workout, pre_workout, general)
             
         Returns:
             Combined results from pose and mindfulness agents
         """
-        # Execute pose agent for form analysis
-        pose_response = await self.execute_agent(
-            agent_name=AgentRole.POSE.value,
+        pose_coro = self.execute_agent(
+            agent_name=POSE_AGENT,
             task={
                 "frames": frames,
                 "exercise_type": exercise_type,
@@ -242,18 +321,37 @@ class OrchestrationEngine:
             user_id=user_id
         )
         
-        # If workout completed, trigger mindfulness agent
         mindfulness_response = None
-        if pose_response.success and pose_response.data.get("workout_complete"):
-            mindfulness_response = await self.execute_agent(
-                agent_name=AgentRole.MINDFULNESS.value,
-                task={
-                    "context": "post_workout",
-                    "workout_summary": pose_response.data.get("summary", {}),
-                    "mood_hint": None
-                },
-                session_id=session_id,
-                user_id=user_id
+        if coaching_context == "post_workout":
+            # Execute pose agent for form analysis
+            pose_response = await pose_coro
+            
+            # If workout completed, trigger mindfulness agent
+            if pose_response.success and pose_response.data.get("workout_complete"):
+                mindfulness_response = await self.execute_agent(
+                    agent_name=MINDFULNESS_AGENT,
+                    task={
+                        "context": "post_workout",
+                        "workout_summary": pose_response.data.get("summary", {}),
+                        "mood_hint": None
+                    },
+                    session_id=session_id,
+                    user_id=user_id
+                )
+        else:
+            # Coaching does not need pose output, so run both agents at once
+            pose_response, mindfulness_response = await asyncio.gather(
+                pose_coro,
+                self.execute_agent(
+                    agent_name=MINDFULNESS_AGENT,
+                    task={
+                        "context": coaching_context,
+                        "workout_summary": {},
+                        "mood_hint": None
+                    },
+                    session_id=session_id,
+                    user_id=user_id
+                )
             )
         
         return {
@@ -281,7 +379,7 @@ class OrchestrationEngine:
             Nutrition analysis results
         """
         nutrition_response = await self.execute_agent(
-            agent_name=AgentRole.NUTRITION.value,
+            agent_name=NUTRITION_AGENT,
             task={
                 "image": image,
                 "mode": "estimate"
@@ -302,12 +400,32 @@ class OrchestrationEngine:
         user_id: Optional[str] = None
     ) -> OrchestrationContext:
         """Get existing context or create new one"""
-        if session_id not in self.active_sessions:
-            self.active_sessions[session_id] = OrchestrationContext(
+        sessions = self.active_sessions
+        now = time.monotonic()
+        # Expired sessions (including this one) are dropped before the lookup
+        self._evict_sessions(now)
+        context = sessions.get(session_id)
+        if context is None:
+            context = sessions[session_id] = OrchestrationContext(
                 session_id=session_id,
                 user_id=user_id
             )
-        return self.active_sessions[session_id]
+            self._evict_sessions(now)
+        else:
+            sessions.move_to_end(session_id)
+        context.last_active = now
+        return context
+    
+    def _evict_sessions(self, now: float) -> None:
+        """Drop idle sessions and the least recently used ones beyond max_sessions"""
+        sessions = self.active_sessions
+        while sessions:
+            session_id, context = next(iter(sessions.items()))
+            if len(sessions) <= self.max_sessions and now - context.last_active <= self.session_ttl:
+                break
+            del sessions[session_id]
+            # Release the session's local memory and cache bookkeeping too
+            self.memory_manager.clear_session(session_id)
     
     async def _apply_output_sanitization(
         self,
@@ -328,16 +446,17 @@ class OrchestrationEngine:
     
     def get_session_summary(self, session_id: str) -> Dict[str, Any]:
         """Get summary of a session"""
-        if session_id not in self.active_sessions:
+        self._evict_sessions(time.monotonic())
+        context = self.active_sessions.get(session_id)
+        if context is None:
             return {"error": "Session not found"}
         
-        context = self.active_sessions[session_id]
         return {
             "session_id": session_id,
             "user_id": context.user_id,
-            "start_time": context.timestamp.isoformat(),
-            "agent_executions": len(context.agent_history),
-            "agents_used": list(set(r.agent for r in context.agent_history)),
-            "total_execution_time": sum(r.execution_time for r in context.agent_history)
+            "start_time": context.timestamp_iso,
+            "agent_executions": context.execution_count,
+            "agents_used": list(context.agents_used),
+            "total_execution_time": context.total_execution_time
         }
 
@@ -0,0 +1,117 @@
+"""
+Background Tasks
+
+Celery tasks that run the heavy pose and nutrition orchestrations outside the
+API process. The API enqueues a task and answers 202 right away; clients poll
+/api/v1/tasks/{task_id} for the result.
+
+Run a worker with:
+    celery -A app.tasks worker --loglevel=INFO
+"""
+
+from typing import Any, Awaitable, Dict
+import asyncio
+import os
+import logging
+
+import orjson
+from celery import Celery
+
+logger = logging.getLogger(__name__)
+
+broker_url = os.getenv("CELERY_BROKER_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+
+celery_app = Celery(
+    "mindbody",
+    broker=broker_url,
+    backend=os.getenv("CELERY_RESULT_BACKEND", broker_url)
+)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+    result_expires=3600
+)
+
+# One event loop per worker process, so agent models and locks created on
+# the first task are reused by later ones
+_loop = None
+
+
+def _run_async(coro: Awaitable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Run a coroutine on this worker process's event loop"""
+    global _loop
+    if _loop is None:
+        _loop = asyncio.new_event_loop()
+    return _loop.run_until_complete(coro)
+
+
+async def _get_engine():
+    """Get the orchestration engine, initializing agents on first use"""
+    from .main import orchestration_engine
+    
+    for agent in orchestration_engine.agents.values():
+        if not agent.state.initialized:
+            await agent.initialize()
+    return orchestration_engine
+
+
+def _to_json(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a result (possibly holding numpy data) to plain JSON types"""
+    return orjson.loads(orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY))
+
+
+async def _run_pose(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from .main import _decode_b64_image_bytes
+    
+    engine = await _get_engine()
+    frames = [_decode_b64_image_bytes(frame) for frame in payload["frames"]]
+    result = await engine.orchestrate_workout_session(
+        session_id=payload["session_id"],
+        frames=frames,
+        exercise_type=payload["exercise_type"],
+        user_id=payload.get("user_id"),
+        coaching_context=payload.get("coaching_context", "post_workout")
+    )
+    return _to_json(result)
+
+
+async def _run_nutrition(payload: Dict[str, Any]) -> Dict[str, Any]:
+    from .main import _decode_b64_image_bytes
+    
+    engine = await _get_engine()
+    result = await engine.orchestrate_nutrition_analysis(
+        session_id=payload["session_id"],
+        image=_decode_b64_image_bytes(payload["image"]),
+        user_id=payload.get("user_id")
+    )
+    return _to_json(result)
+
+
+@celery_app.task(name="mindbody.run_pose")
+def run_pose(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a workout session orchestration.
+    
+    Args:
+        payload: PoseRequest fields with a resolved session_id
+    
+    Returns:
+        Same result as /api/v1/pose/infer
+    """
+    return _run_async(_run_pose(payload))
+
+
+@celery_app.task(name="mindbody.run_nutrition")
+def run_nutrition(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run a nutrition analysis orchestration.
+    
+    Args:
+        payload: NutritionRequest fields with a resolved session_id
+    
+    Returns:
+        Same result as /api/v1/food/estimate
+    """
+    return _run_async(_run_nutrition(payload))
@@ -5,18 +5,18 @@ All tools inherit from this base class, which provides common functionality
 for parameter validation, execution tracking, and error handling.
 """
 
-from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, ClassVar
 from dataclasses import dataclass
-from datetime import datetime
+from types import MappingProxyType
 import logging
+import time
 
 from ..orchestration.context import OrchestrationContext
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResult:
     """Result from tool execution"""
     success: bool
@@ -26,13 +26,40 @@ class ToolResult:
     metadata: Dict[str, Any] = None
 
 
-class BaseTool(ABC):
+_new_result = ToolResult.__new__
+
+
+def _success_result(data: Any, execution_time: float) -> ToolResult:
+    """Build a successful ToolResult without the generated __init__'s argument handling"""
+    result = _new_result(ToolResult)
+    result.success = True
+    result.data = data
+    result.error = None
+    result.execution_time = execution_time
+    result.metadata = None
+    return result
+
+
+class BaseTool:
     """
     Base class for all tools in the system.
     
     Tools are reusable functions that agents can call to perform specific tasks.
     """
     
+    # Tool subclasses declare empty __slots__ so instances carry no __dict__
+    __slots__ = ("name", "description", "parameters", "execution_count", "_info")
+    
+    # Process-wide instance returned by get(), set per subclass
+    _instance: ClassVar[Optional["BaseTool"]] = None
+    
+    # Whether validate_parameters is overridden; the default always passes
+    _HAS_VALIDATION: ClassVar[bool] = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._HAS_VALIDATION = cls.validate_parameters is not BaseTool.validate_parameters
+    
     def __init__(
         self,
         name: str,
@@ -43,8 +70,27 @@ class BaseTool(ABC):
         self.description = description
         self.parameters = parameters or {}
         self.execution_count = 0
+        # Static part of get_info(), built once; parameters dicts are shared
+        # module-level constants, so treat them as read-only
+        self._info = MappingProxyType({
+            "name": name,
+            "description": description,
+            "parameters": self.parameters
+        })
         
-    @abstractmethod
+    @classmethod
+    def get(cls) -> "BaseTool":
+        """
+        Get the shared instance of this tool, constructing it on first use.
+        
+        Tools hold no per-request state, so all agents can share one instance.
+        """
+        instance = cls.__dict__.get("_instance")
+        if instance is None:
+            instance = cls()
+            cls._instance = instance
+        return instance
+    
     async def execute(
         self,
         parameters: Dict[str, Any],
@@ -60,7 +106,7 @@ class BaseTool(ABC):
         Returns:
             Tool execution result
         """
-        pass
+        raise NotImplementedError(f"{type(self).__name__} must implement execute()")
     
     def validate_parameters(self, parameters: Dict[str, Any]) -> bool:
         """
@@ -76,10 +122,10 @@ class BaseTool(ABC):
         context: OrchestrationContext
     ) -> ToolResult:
         """Execute tool with parameter validation and error handling"""
-        start_time = datetime.now()
+        start = time.perf_counter()
         
         try:
-            if not self.validate_parameters(parameters):
+            if self._HAS_VALIDATION and not self.validate_parameters(parameters):
                 return ToolResult(
                     success=False,
                     data=None,
@@ -87,19 +133,15 @@ class BaseTool(ABC):
                 )
             
             result = await self.execute(parameters, context)
-            execution_time = (datetime.now() - start_time).total_seconds()
+            execution_time = time.perf_counter() - start
             
             self.execution_count += 1
             
-            return ToolResult(
-                success=True,
-                data=result,
-                execution_time=execution_time
-            )
+            return _success_result(result, execution_time)
             
         except Exception as e:
-            logger.error(f"Error executing tool {self.name}: {str(e)}", exc_info=True)
-            execution_time = (datetime.now() - start_time).total_seconds()
+            logger.error("Error executing tool %s: %s", self.name, e, exc_info=True)
+            execution_time = time.perf_counter() - start
             return ToolResult(
                 success=False,
                 data=None,
@@ -109,10 +151,5 @@ class BaseTool(ABC):
     
     def get_info(self) -> Dict[str, Any]:
         """Get tool information"""
-        return {
-            "name": self.name,
-            "description": self.description,
-            "parameters": self.parameters,
-            "execution_count": self.execution_count
-        }
+        return {**self._info, "execution_count": self.execution_count}
 
@@ -4,69 +4,119 @@ Mindfulness & Coaching Tools
 Tools for generating micro-lessons, journaling prompts, mood analysis, and breathing guides.
 """
 
-from typing import Dict, Any, List
+from typing import Dict, Any, Mapping, Sequence, Tuple
+from types import MappingProxyType
 import random
 
+import numpy as np
+
 from .base import BaseTool
 from ..orchestration.context import OrchestrationContext
 
 
+# Shared read-only default for optional mapping parameters
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
 # Template-based micro-lessons
 MICRO_LESSON_TEMPLATES = {
-    "post_workout": [
+    "post_workout": (
         "Breathe in for 4 counts, hold for 2, out for 6. Repeat 6 times. You built consistency today — that compounds. Remember one progress point.",
         "Take 5 deep breaths. Each rep you completed is a step toward your goal. Progress isn't always linear, but you showed up. That's what matters.",
         "Inhale strength, exhale doubt. You pushed through today. Notice how your body feels — acknowledge the effort you just made."
-    ],
-    "pre_workout": [
+    ),
+    "pre_workout": (
         "Take 3 deep breaths. Set your intention: what do you want to accomplish today? Visualize success.",
         "Breathe in confidence, out any hesitation. You're prepared. Trust your training and give your best effort.",
-    ],
-    "general": [
+    ),
+    "general": (
         "Breathe in for 4, hold 2, out 6. This moment is yours. What's one thing you're grateful for today?",
         "Take a moment. Inhale presence, exhale distraction. You're exactly where you need to be right now.",
-    ]
+    )
 }
 
 JOURNAL_PROMPTS = {
-    "post_workout": [
+    "post_workout": (
         "What did you push through just now?",
         "What's one thing you learned about yourself during this workout?",
         "How did your body feel during the hardest part?",
         "What progress did you notice today, even if small?",
-    ],
-    "pre_workout": [
+    ),
+    "pre_workout": (
         "What's your intention for today's session?",
         "What are you hoping to achieve or improve?",
-    ],
-    "general": [
+    ),
+    "general": (
         "What's one thing you're grateful for today?",
         "What challenge did you overcome recently?",
         "How are you feeling right now, and why?",
-    ]
+    )
 }
 
-BREATHING_PATTERNS = [
+BREATHING_PATTERNS = (
     {"name": "Box Breathing", "pattern": "4-4-4-4", "description": "Inhale 4, hold 4, exhale 4, hold 4"},
     {"name": "4-7-8 Breathing", "pattern": "4-7-8", "description": "Inhale 4, hold 7, exhale 8"},
     {"name": "Equal Breathing", "pattern": "4-4", "description": "Inhale 4, exhale 4"},
-]
+)
+
+# Seconds per breathing cycle, derived once from each pattern (e.g. 4-7-8 -> 19)
+for _pattern in BREATHING_PATTERNS:
+    _pattern["cycle_time"] = sum(int(count) for count in _pattern["pattern"].split("-"))
+del _pattern
+
+# (choices, count) per context so each pick is a single randrange + index
+_LESSON_PICKERS = {ctx: (choices, len(choices)) for ctx, choices in MICRO_LESSON_TEMPLATES.items()}
+_PROMPT_PICKERS = {ctx: (choices, len(choices)) for ctx, choices in JOURNAL_PROMPTS.items()}
+_BREATHING_PATTERN_COUNT = len(BREATHING_PATTERNS)
+_GENERAL_LESSONS = _LESSON_PICKERS["general"]
+_GENERAL_PROMPTS = _PROMPT_PICKERS["general"]
+
+
+def _cumulative_weights(weights: Sequence[float]) -> np.ndarray:
+    """Build the normalized CDF used by _weighted_choice, once per pool"""
+    cdf = np.cumsum(np.asarray(weights, dtype=np.float64))
+    cdf /= cdf[-1]
+    cdf[-1] = 1.0
+    return cdf
+
+
+def _weighted_choice(pool: Tuple[Any, ...], cdf: np.ndarray) -> Any:
+    """
+    Pick from a template pool with per-template priors.
+    
+    Args:
+        pool: Templates to choose from
+        cdf: Precomputed output of _cumulative_weights for the pool
+        
+    Returns:
+        One template, found by binary search instead of a linear scan
+    """
+    return pool[int(np.searchsorted(cdf, random.random(), side="right"))]
+
+
+# Result skeletons: execute() copies one and fills in the per-call fields
+_LESSON_RESULT = {"lesson_text": None, "context": None, "duration_seconds": None, "type": "micro_lesson"}
+_PROMPT_RESULT = {"prompt": None, "context": None, "max_words": 50, "type": "journal_prompt"}
+
+
+_GENERATE_MICRO_LESSON_PARAMS = {
+    "context": "Context (post_workout, pre_workout, general)",
+    "mood_analysis": "Optional mood analysis",
+    "workout_summary": "Optional workout summary",
+    "user_history": "Optional user history",
+    "duration_seconds": "Desired duration in seconds"
+}
 
 
 class GenerateMicroLessonTool(BaseTool):
     """Generate a short mindfulness micro-lesson"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="generate_micro_lesson",
             description="Generate a short mindfulness or grit micro-lesson",
-            parameters={
-                "context": "Context (post_workout, pre_workout, general)",
-                "mood_analysis": "Optional mood analysis",
-                "workout_summary": "Optional workout summary",
-                "user_history": "Optional user history",
-                "duration_seconds": "Desired duration in seconds"
-            }
+            parameters=_GENERATE_MICRO_LESSON_PARAMS
         )
     
     async def execute(
@@ -77,12 +127,12 @@ class GenerateMicroLessonTool(BaseTool):
         """Generate micro-lesson"""
         lesson_context = parameters.get("context", "general")
         mood_analysis = parameters.get("mood_analysis")
-        workout_summary = parameters.get("workout_summary", {})
+        workout_summary = parameters.get("workout_summary", _EMPTY)
         duration_seconds = parameters.get("duration_seconds", 60)
         
         # Select template based on context
-        templates = MICRO_LESSON_TEMPLATES.get(lesson_context, MICRO_LESSON_TEMPLATES["general"])
-        lesson_text = random.choice(templates)
+        templates, count = _LESSON_PICKERS.get(lesson_context, _GENERAL_LESSONS)
+        lesson_text = templates[random.randrange(count)]
         
         # Customize based on workout summary if available
         if workout_summary and "form_score" in workout_summary:
@@ -92,26 +142,30 @@ class GenerateMicroLessonTool(BaseTool):
             elif score >= 75:
                 lesson_text += " Good effort — keep refining."
         
-        return {
-            "lesson_text": lesson_text,
-            "context": lesson_context,
-            "duration_seconds": duration_seconds,
-            "type": "micro_lesson"
-        }
+        result = _LESSON_RESULT.copy()
+        result["lesson_text"] = lesson_text
+        result["context"] = lesson_context
+        result["duration_seconds"] = duration_seconds
+        return result
+
+
+_CREATE_JOURNAL_PROMPT_PARAMS = {
+    "context": "Context for the prompt",
+    "workout_summary": "Optional workout summary",
+    "mood_analysis": "Optional mood analysis"
+}
 
 
 class CreateJournalPromptTool(BaseTool):
     """Create a journaling prompt"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="create_journal_prompt",
             description="Create a journaling prompt for reflection",
-            parameters={
-                "context": "Context for the prompt",
-                "workout_summary": "Optional workout summary",
-                "mood_analysis": "Optional mood analysis"
-            }
+            parameters=_CREATE_JOURNAL_PROMPT_PARAMS
         )
     
     async def execute(
@@ -121,31 +175,51 @@ class CreateJournalPromptTool(BaseTool):
     ) -> Dict[str, Any]:
         """Create journal prompt"""
         prompt_context = parameters.get("context", "general")
-        workout_summary = parameters.get("workout_summary", {})
+        workout_summary = parameters.get("workout_summary", _EMPTY)
         
-        prompts = JOURNAL_PROMPTS.get(prompt_context, JOURNAL_PROMPTS["general"])
-        prompt = random.choice(prompts)
+        prompts, count = _PROMPT_PICKERS.get(prompt_context, _GENERAL_PROMPTS)
+        prompt = prompts[random.randrange(count)]
         
-        return {
-            "prompt": prompt,
-            "context": prompt_context,
-            "max_words": 50,
-            "type": "journal_prompt"
-        }
+        result = _PROMPT_RESULT.copy()
+        result["prompt"] = prompt
+        result["context"] = prompt_context
+        return result
+
+
+# Simple mood mapping: lowercase hint -> (valence, energy, label)
+MOOD_MAP = {
+    "frustrated": (-0.5, 0.3, "Frustrated"),
+    "tired": (-0.2, -0.5, "Tired"),
+    "motivated": (0.7, 0.8, "Motivated"),
+    "neutral": (0.0, 0.0, "Neutral"),
+}
+_NEUTRAL_MOOD = MOOD_MAP["neutral"]
+
+MOOD_RECOMMENDATIONS = {
+    "Frustrated": ("Focus on one small win", "Take a moment to breathe", "Remember progress takes time"),
+    "Tired": ("Listen to your body", "Consider a lighter session", "Rest is part of training"),
+    "Motivated": ("Channel this energy", "Set a challenging but achievable goal", "Enjoy the momentum"),
+}
+DEFAULT_MOOD_RECOMMENDATIONS = ("Stay present", "Focus on the process")
+
+
+_ANALYZE_MOOD_PARAMS = {
+    "mood_hint": "User-provided mood hint",
+    "context": "Context (post_workout, etc.)",
+    "workout_summary": "Optional workout summary"
+}
 
 
 class AnalyzeMoodTool(BaseTool):
     """Analyze user mood from hints and context"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="analyze_mood",
             description="Analyze user mood and emotional state",
-            parameters={
-                "mood_hint": "User-provided mood hint",
-                "context": "Context (post_workout, etc.)",
-                "workout_summary": "Optional workout summary"
-            }
+            parameters=_ANALYZE_MOOD_PARAMS
         )
     
     async def execute(
@@ -156,55 +230,47 @@ class AnalyzeMoodTool(BaseTool):
         """Analyze mood"""
         mood_hint = parameters.get("mood_hint", "neutral")
         workout_context = parameters.get("context", "general")
-        workout_summary = parameters.get("workout_summary", {})
+        workout_summary = parameters.get("workout_summary", _EMPTY)
         
-        # Simple mood mapping
-        mood_map = {
-            "frustrated": {"valence": -0.5, "energy": 0.3, "label": "Frustrated"},
-            "tired": {"valence": -0.2, "energy": -0.5, "label": "Tired"},
-            "motivated": {"valence": 0.7, "energy": 0.8, "label": "Motivated"},
-            "neutral": {"valence": 0.0, "energy": 0.0, "label": "Neutral"},
-        }
-        
-        mood_data = mood_map.get(mood_hint.lower(), mood_map["neutral"])
+        valence, energy, label = MOOD_MAP.get(mood_hint.lower(), _NEUTRAL_MOOD)
         
         # Adjust based on workout performance
         if workout_summary and "form_score" in workout_summary:
             score = workout_summary["form_score"]
             if score >= 90:
-                mood_data["valence"] += 0.2
+                valence += 0.2
             elif score < 60:
-                mood_data["valence"] -= 0.1
+                valence -= 0.1
         
         return {
-            "mood": mood_data["label"],
-            "valence": mood_data["valence"],
-            "energy": mood_data["energy"],
+            "mood": label,
+            "valence": valence,
+            "energy": energy,
             "context": workout_context,
-            "recommendations": self._get_mood_recommendations(mood_data["label"])
+            "recommendations": self._get_mood_recommendations(label)
         }
     
-    def _get_mood_recommendations(self, mood: str) -> List[str]:
+    def _get_mood_recommendations(self, mood: str) -> Tuple[str, ...]:
         """Get recommendations based on mood"""
-        recommendations = {
-            "Frustrated": ["Focus on one small win", "Take a moment to breathe", "Remember progress takes time"],
-            "Tired": ["Listen to your body", "Consider a lighter session", "Rest is part of training"],
-            "Motivated": ["Channel this energy", "Set a challenging but achievable goal", "Enjoy the momentum"],
-        }
-        return recommendations.get(mood, ["Stay present", "Focus on the process"])
+        return MOOD_RECOMMENDATIONS.get(mood, DEFAULT_MOOD_RECOMMENDATIONS)
+
+
+_GENERATE_BREATHING_GUIDE_PARAMS = {
+    "context": "Context for breathing guide",
+    "duration_seconds": "Duration of breathing exercise"
+}
 
 
 class GenerateBreathingGuideTool(BaseTool):
     """Generate a breathing exercise guide"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="generate_breathing_guide",
             description="Generate a guided breathing exercise",
-            parameters={
-                "context": "Context for breathing guide",
-                "duration_seconds": "Duration of breathing exercise"
-            }
+            parameters=_GENERATE_BREATHING_GUIDE_PARAMS
         )
     
     async def execute(
@@ -216,17 +282,10 @@ class GenerateBreathingGuideTool(BaseTool):
         breathing_context = parameters.get("context", "general")
         duration_seconds = parameters.get("duration_seconds", 60)
         
-        pattern = random.choice(BREATHING_PATTERNS)
+        pattern = BREATHING_PATTERNS[random.randrange(_BREATHING_PATTERN_COUNT)]
         
         # Calculate cycles based on duration
-        if pattern["pattern"] == "4-4-4-4":
-            cycle_time = 16  # 4+4+4+4
-        elif pattern["pattern"] == "4-7-8":
-            cycle_time = 19  # 4+7+8
-        else:
-            cycle_time = 8  # 4+4
-        
-        cycles = max(1, duration_seconds // cycle_time)
+        cycles = max(1, duration_seconds // pattern["cycle_time"])
         
         return {
             "pattern_name": pattern["name"],
@@ -4,9 +4,11 @@ Nutrition Analysis Tools
 Tools for food classification, portion estimation, and nutrition calculation.
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List
 import random
 
+import numpy as np
+
 from .base import BaseTool
 from ..orchestration.context import OrchestrationContext
 
@@ -25,19 +27,57 @@ FOOD_DATABASE = {
     "salmon": {"calories_per_100g": 208, "protein_per_100g": 20},
 }
 
+# (calories, protein) per 100g, unpacked once from FOOD_DATABASE
+_NUTRITION_PER_100G = {
+    food: (data["calories_per_100g"], data["protein_per_100g"])
+    for food, data in FOOD_DATABASE.items()
+}
+_DEFAULT_NUTRITION = _NUTRITION_PER_100G["grilled_chicken"]
+
+# Food labels for mock predictions
+_FOOD_KEYS = tuple(FOOD_DATABASE)
+_FOOD_COUNT = len(_FOOD_KEYS)
+
+# Row-aligned (calories, protein) per 100g for batched calculation
+_NUTRITION_ROWS = np.array([_NUTRITION_PER_100G[food] for food in _FOOD_KEYS], dtype=np.float64)
+_NUTRITION_ROW_INDEX = {food: i for i, food in enumerate(_FOOD_KEYS)}
+_DEFAULT_NUTRITION_ROW = _NUTRITION_ROW_INDEX["grilled_chicken"]
+
+# Below this many items the scalar path is faster than building arrays
+BATCH_VECTORIZE_MIN = 32
+
+
+def _round_tenths(values: np.ndarray) -> np.ndarray:
+    """
+    Round to one decimal exactly like the builtin round(x, 1).
+    
+    np.round scales by 10 and rounds half to even, which disagrees with
+    round() on values whose decimal form ends in 5, so those few are
+    re-rounded in Python.
+    """
+    rounded = np.round(values, 1)
+    for i in np.flatnonzero(np.abs(values * 10 % 1 - 0.5) < 1e-6).tolist():
+        rounded.flat[i] = round(float(values.flat[i]), 1)
+    return rounded
+
+
+_CLASSIFY_FOOD_PARAMS = {
+    "image": "Food image",
+    "model": "Classification model",
+    "top_k": "Number of top predictions"
+}
+
 
 class ClassifyFoodTool(BaseTool):
     """Classify food from image"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="classify_food",
             description="Classify food type from image",
-            parameters={
-                "image": "Food image",
-                "model": "Classification model",
-                "top_k": "Number of top predictions"
-            }
+            parameters=_CLASSIFY_FOOD_PARAMS
         )
     
     async def execute(
@@ -52,19 +92,13 @@ class ClassifyFoodTool(BaseTool):
         
         # Placeholder: In production, run EfficientNet inference
         # For MVP, return mock predictions
-        possible_foods = list(FOOD_DATABASE.keys())
-        predictions = []
-        
-        for i in range(top_k):
-            food = random.choice(possible_foods)
-            confidence = random.uniform(0.6, 0.95)
-            predictions.append({
-                "label": food,
-                "confidence": round(confidence, 2)
-            })
-        
-        # Sort by confidence
-        predictions.sort(key=lambda x: x["confidence"], reverse=True)
+        # Distinct labels like a real classifier, confidences drawn pre-sorted
+        foods = random.sample(_FOOD_KEYS, min(top_k, _FOOD_COUNT))
+        confidences = sorted((random.random() * 0.35 + 0.6 for _ in foods), reverse=True)
+        predictions = [
+            {"label": food, "confidence": round(confidence, 2)}
+            for food, confidence in zip(foods, confidences)
+        ]
         
         return {
             "top_class": predictions[0]["label"],
@@ -74,18 +108,36 @@ class ClassifyFoodTool(BaseTool):
         }
 
 
+# Map size to grams (rough estimates)
+SIZE_TO_GRAMS = {
+    "small": 100,
+    "medium": 200,
+    "large": 300
+}
+
+
+# Result skeleton copied by EstimatePortionTool; confidence is fixed until
+# the image-based estimate exists
+_PORTION_RESULT = {"portion_grams": None, "size_estimate": None, "confidence": 0.7, "food_class": None}
+
+
+_ESTIMATE_PORTION_PARAMS = {
+    "image": "Food image",
+    "food_class": "Classified food type",
+    "user_hints": "Optional user corrections"
+}
+
+
 class EstimatePortionTool(BaseTool):
     """Estimate portion size from image"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="estimate_portion",
             description="Estimate food portion size in grams",
-            parameters={
-                "image": "Food image",
-                "food_class": "Classified food type",
-                "user_hints": "Optional user corrections"
-            }
+            parameters=_ESTIMATE_PORTION_PARAMS
         )
     
     async def execute(
@@ -105,35 +157,32 @@ class EstimatePortionTool(BaseTool):
             # Estimate from image (placeholder)
             size = "medium"
         
-        # Map size to grams (rough estimates)
-        size_to_grams = {
-            "small": 100,
-            "medium": 200,
-            "large": 300
-        }
-        
-        portion_grams = size_to_grams.get(size, 200)
+        portion_grams = SIZE_TO_GRAMS.get(size, 200)
         
-        return {
-            "portion_grams": portion_grams,
-            "size_estimate": size,
-            "confidence": 0.7,
-            "food_class": food_class
-        }
+        result = _PORTION_RESULT.copy()
+        result["portion_grams"] = portion_grams
+        result["size_estimate"] = size
+        result["food_class"] = food_class
+        return result
+
+
+_CALCULATE_NUTRITION_PARAMS = {
+    "food_class": "Classified food type",
+    "portion_grams": "Portion size in grams",
+    "confidence": "Classification confidence"
+}
 
 
 class CalculateNutritionTool(BaseTool):
     """Calculate nutrition from food class and portion"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="calculate_nutrition",
             description="Calculate calories and macros from food and portion",
-            parameters={
-                "food_class": "Classified food type",
-                "portion_grams": "Portion size in grams",
-                "confidence": "Classification confidence"
-            }
+            parameters=_CALCULATE_NUTRITION_PARAMS
         )
     
     async def execute(
@@ -146,39 +195,104 @@ class CalculateNutritionTool(BaseTool):
         portion_grams = parameters.get("portion_grams", 200)
         confidence = parameters.get("confidence", 0.7)
         
-        food_data = FOOD_DATABASE.get(food_class, FOOD_DATABASE["grilled_chicken"])
+        calories_per_100g, protein_per_100g = _NUTRITION_PER_100G.get(food_class, _DEFAULT_NUTRITION)
         
         # Calculate based on portion
-        calories = (food_data["calories_per_100g"] * portion_grams) / 100
-        protein = (food_data["protein_per_100g"] * portion_grams) / 100
+        calories = calories_per_100g * portion_grams / 100
+        protein = protein_per_100g * portion_grams / 100
         
         # Add uncertainty based on confidence
         uncertainty = 1 - confidence
-        calories_range = (calories * (1 - uncertainty), calories * (1 + uncertainty))
-        protein_range = (protein * (1 - uncertainty), protein * (1 + uncertainty))
+        low = 1 - uncertainty
+        high = 1 + uncertainty
         
         return {
             "calories": round(calories, 1),
-            "calories_range": [round(c, 1) for c in calories_range],
+            "calories_range": [round(calories * low, 1), round(calories * high, 1)],
             "protein_grams": round(protein, 1),
-            "protein_range": [round(p, 1) for p in protein_range],
+            "protein_range": [round(protein * low, 1), round(protein * high, 1)],
             "portion_grams": portion_grams,
             "food_class": food_class,
             "confidence": confidence
         }
+    
+    async def execute_batch(
+        self,
+        items: List[Dict[str, Any]],
+        context: OrchestrationContext
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate nutrition for several foods at once, e.g. a logged meal.
+        
+        Args:
+            items: Parameters for each food, as accepted by execute()
+            context: Orchestration context
+            
+        Returns:
+            One result per item, identical to calling execute() on each
+        """
+        if len(items) < BATCH_VECTORIZE_MIN:
+            return [await self.execute(item, context) for item in items]
+        
+        food_classes = [item.get("food_class", "grilled_chicken") for item in items]
+        portions = [item.get("portion_grams", 200) for item in items]
+        confidences = [item.get("confidence", 0.7) for item in items]
+        
+        rows = np.fromiter(
+            (_NUTRITION_ROW_INDEX.get(food_class, _DEFAULT_NUTRITION_ROW) for food_class in food_classes),
+            dtype=np.intp,
+            count=len(items)
+        )
+        # Same operation order as execute() so rounded values match exactly
+        totals = _NUTRITION_ROWS[rows] * np.asarray(portions, dtype=np.float64)[:, np.newaxis] / 100
+        uncertainty = (1 - np.asarray(confidences, dtype=np.float64))[:, np.newaxis]
+        # Columns: calories, protein, calories_low, protein_low, calories_high, protein_high
+        values = _round_tenths(np.hstack((totals, totals * (1 - uncertainty), totals * (1 + uncertainty))))
+        
+        return [
+            {
+                "calories": calories,
+                "calories_range": [calories_low, calories_high],
+                "protein_grams": protein,
+                "protein_range": [protein_low, protein_high],
+                "portion_grams": portion_grams,
+                "food_class": food_class,
+                "confidence": confidence
+            }
+            for (calories, protein, calories_low, protein_low, calories_high, protein_high),
+                portion_grams, food_class, confidence
+            in zip(values.tolist(), portions, food_classes, confidences)
+        ]
+
+
+# Simple suggestion logic: food class -> (swap, reason, calorie savings)
+HEALTHIER_SWAPS = {
+    "fries": ("roasted_sweet_potato", "Lower calories, more fiber and nutrients", 50),
+    "burger": ("grilled_chicken", "Higher protein, lower saturated fat", 30),
+}
+
+GENERAL_NUTRITION_TIPS = (
+    "Add a side of vegetables for more fiber",
+    "Consider portion size - aim for palm-sized protein portions"
+)
+
+
+_SUGGEST_IMPROVEMENTS_PARAMS = {
+    "food_class": "Current food type",
+    "current_nutrition": "Current nutrition data"
+}
 
 
 class SuggestImprovementsTool(BaseTool):
     """Suggest nutritional improvements"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="suggest_improvements",
             description="Suggest healthier alternatives or improvements",
-            parameters={
-                "food_class": "Current food type",
-                "current_nutrition": "Current nutrition data"
-            }
+            parameters=_SUGGEST_IMPROVEMENTS_PARAMS
         )
     
     async def execute(
@@ -190,27 +304,19 @@ class SuggestImprovementsTool(BaseTool):
         food_class = parameters.get("food_class", "grilled_chicken")
         current_nutrition = parameters.get("current_nutrition", {})
         
+        swap = HEALTHIER_SWAPS.get(food_class)
         suggestions = []
         
-        # Simple suggestion logic
-        if food_class == "fries":
-            suggestions.append({
-                "swap": "roasted_sweet_potato",
-                "reason": "Lower calories, more fiber and nutrients",
-                "calorie_savings": 50
-            })
-        elif food_class == "burger":
+        if swap is not None:
+            alternative, reason, calorie_savings = swap
             suggestions.append({
-                "swap": "grilled_chicken",
-                "reason": "Higher protein, lower saturated fat",
-                "calorie_savings": 30
+                "swap": alternative,
+                "reason": reason,
+                "calorie_savings": calorie_savings
             })
         
         return {
             "suggestions": suggestions,
-            "tips": [
-                "Add a side of vegetables for more fiber",
-                "Consider portion size - aim for palm-sized protein portions"
-            ]
+            "tips": GENERAL_NUTRITION_TIPS
         }
 
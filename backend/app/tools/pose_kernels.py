@@ -0,0 +1,134 @@
+"""
+Pose Kernels
+
+Numeric kernels for joint-angle and rep-counting computations over keypoint
+arrays. Kernels are JIT-compiled with Numba when it is installed and run as
+plain Python otherwise.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    def njit(*args, **kwargs):
+        """Fallback that leaves the function uncompiled"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, fastmath=True)
+def compute_joint_angles(keypoints: np.ndarray, a: int, b: int, c: int) -> np.ndarray:
+    """
+    Compute the angle at joint b formed by joints a-b-c for every frame.
+    
+    Args:
+        keypoints: Contiguous float32 array of shape (N_frames, N_joints, >=2)
+        a: Index of the first joint
+        b: Index of the vertex joint
+        c: Index of the last joint
+    
+    Returns:
+        float32 array of shape (N_frames,) with angles in degrees (0-180)
+    """
+    n_frames = keypoints.shape[0]
+    angles = np.empty(n_frames, dtype=np.float32)
+    for i in range(n_frames):
+        bax = keypoints[i, a, 0] - keypoints[i, b, 0]
+        bay = keypoints[i, a, 1] - keypoints[i, b, 1]
+        bcx = keypoints[i, c, 0] - keypoints[i, b, 0]
+        bcy = keypoints[i, c, 1] - keypoints[i, b, 1]
+        angle = abs(math.degrees(math.atan2(bcy, bcx) - math.atan2(bay, bax)))
+        if angle > 180.0:
+            angle = 360.0 - angle
+        angles[i] = angle
+    return angles
+
+
+@njit(cache=True)
+def count_reps_from_angle(
+    angle_signal: np.ndarray,
+    down_threshold: float,
+    up_threshold: float
+) -> int:
+    """
+    Count reps from a joint-angle signal with a hysteresis state machine.
+    
+    A rep is counted each time the angle drops below down_threshold and then
+    rises back above up_threshold.
+    
+    Args:
+        angle_signal: 1-D array of joint angles in degrees
+        down_threshold: Angle below which the joint is in the "down" phase
+        up_threshold: Angle above which the joint is back in the "up" phase
+    
+    Returns:
+        Number of completed reps
+    """
+    reps = 0
+    is_down = False
+    for angle in angle_signal:
+        if not is_down and angle < down_threshold:
+            is_down = True
+        elif is_down and angle > up_threshold:
+            reps += 1
+            is_down = False
+    return reps
+
+
+@njit(cache=True)
+def count_peaks(signal: np.ndarray, min_distance: int, prominence: float) -> int:
+    """
+    Count movement cycles in a 1-D joint-position signal in a single pass.
+    
+    A peak is counted when the signal rises at least `prominence` above the
+    last trough and then falls back at least `prominence` from its maximum.
+    Peaks closer than `min_distance` samples to the previous counted peak are
+    treated as jitter and ignored.
+    
+    Args:
+        signal: 1-D array of joint coordinates over frames
+        min_distance: Minimum number of frames between counted peaks
+        prominence: Minimum rise and fall around a peak
+    
+    Returns:
+        Number of peaks
+    """
+    n = signal.shape[0]
+    if n == 0:
+        return 0
+    peaks = 0
+    last_peak = -min_distance
+    trough = signal[0]
+    peak = signal[0]
+    peak_idx = 0
+    rising = False
+    for i in range(1, n):
+        value = signal[i]
+        if not rising:
+            if value < trough:
+                trough = value
+            elif value - trough >= prominence:
+                rising = True
+                peak = value
+                peak_idx = i
+        elif value > peak:
+            peak = value
+            peak_idx = i
+        elif peak - value >= prominence:
+            if peak_idx - last_peak >= min_distance:
+                peaks += 1
+                last_peak = peak_idx
+            rising = False
+            trough = value
+    return peaks
+
+
+def warm_up_kernels() -> None:
+    """Compile (or load from Numba's cache) every kernel ahead of the first request"""
+    keypoints = np.zeros((2, 3, 4), dtype=np.float32)
+    angles = compute_joint_angles(keypoints, 0, 1, 2)
+    count_reps_from_angle(angles, 100.0, 160.0)
+    count_peaks(keypoints[:, 0, 1], 1, 0.05)
@@ -2,26 +2,331 @@
 Pose Analysis Tools
 
 Tools for pose estimation, form error detection, rep counting, and scoring.
+
+Keypoints are passed between tools as a single float32 array of shape
+(N_frames, N_joints, 4), where joints follow JOINT_NAMES and the last axis
+is (x, y, z, visibility).
 """
 
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass
+from bisect import bisect_right
+from operator import attrgetter
+import heapq
 import numpy as np
 
 from .base import BaseTool
+from .pose_kernels import compute_joint_angles, count_peaks, count_reps_from_angle
 from ..orchestration.context import OrchestrationContext
 
 
+JOINT_NAMES = (
+    "left_shoulder", "right_shoulder",
+    "left_elbow", "right_elbow",
+    "left_hip", "right_hip",
+    "left_knee", "right_knee",
+    "left_ankle", "right_ankle",
+)
+JOINT_INDEX = {name: i for i, name in enumerate(JOINT_NAMES)}
+KEYPOINT_FIELDS = ("x", "y", "z", "visibility")
+X, Y, Z, VISIBILITY = range(len(KEYPOINT_FIELDS))
+
+# Mock keypoints for a single frame, shape (N_joints, 4)
+_MOCK_KEYPOINTS = np.array([
+    [0.3, 0.2, 0.0, 0.9],    # left_shoulder
+    [0.7, 0.2, 0.0, 0.9],    # right_shoulder
+    [0.25, 0.4, 0.0, 0.85],  # left_elbow
+    [0.75, 0.4, 0.0, 0.85],  # right_elbow
+    [0.35, 0.5, 0.0, 0.9],   # left_hip
+    [0.65, 0.5, 0.0, 0.9],   # right_hip
+    [0.35, 0.7, 0.0, 0.85],  # left_knee
+    [0.65, 0.7, 0.0, 0.85],  # right_knee
+    [0.35, 0.9, 0.0, 0.8],   # left_ankle
+    [0.65, 0.9, 0.0, 0.8],   # right_ankle
+], dtype=np.float32)
+_MOCK_KEYPOINTS.setflags(write=False)
+
+
+def pack_keypoints(
+    keypoints: Union[np.ndarray, Sequence[Dict[str, Any]]]
+) -> np.ndarray:
+    """
+    Convert keypoints to a (N_frames, N_joints, 4) float32 array.
+    
+    Accepts either an existing array or a list of per-frame dictionaries in
+    the legacy {"keypoints": {joint: {"x", "y", "z", "visibility"}}} format.
+    Missing joints are filled with zeros. float32 arrays, including read-only
+    broadcast views, are returned without copying.
+    """
+    if isinstance(keypoints, np.ndarray):
+        return np.asarray(keypoints, dtype=np.float32)
+    
+    packed = np.zeros((len(keypoints), len(JOINT_NAMES), len(KEYPOINT_FIELDS)), dtype=np.float32)
+    for frame_idx, frame in enumerate(keypoints):
+        for joint, point in frame.get("keypoints", {}).items():
+            joint_idx = JOINT_INDEX.get(joint)
+            if joint_idx is not None:
+                packed[frame_idx, joint_idx] = [point.get(f, 0.0) for f in KEYPOINT_FIELDS]
+    return packed
+
+
+_PACKED_KEYPOINTS_KEY = "packed_keypoints"
+
+
+def get_or_pack_keypoints(
+    context: Optional[OrchestrationContext],
+    keypoints: Union[np.ndarray, Sequence[Dict[str, Any]]]
+) -> np.ndarray:
+    """
+    pack_keypoints, reusing the array already packed from the same object.
+    
+    Arrays pack without copying, so only legacy per-frame dict lists are
+    cached. The context keeps the last packed list, so tools sharing one
+    sequence within an orchestration convert it once.
+    """
+    if isinstance(keypoints, np.ndarray) or context is None:
+        return pack_keypoints(keypoints)
+    
+    cached = context.cache.get(_PACKED_KEYPOINTS_KEY)
+    if cached is not None and cached[0] is keypoints:
+        return cached[1]
+    packed = pack_keypoints(keypoints)
+    context.cache[_PACKED_KEYPOINTS_KEY] = (keypoints, packed)
+    return packed
+
+
+# Knee angle (hip-knee-ankle) thresholds in degrees for the down/up phases
+KNEE_REP_THRESHOLDS = {
+    "squat": (100.0, 160.0),
+    "lunge": (110.0, 160.0),
+}
+
+# Joint whose vertical position traces each rep; other exercises use the hip
+REP_SIGNAL_JOINTS = {
+    "bicep_curl": "left_elbow",
+    "tricep_extension": "left_elbow",
+    "shoulder_press": "left_elbow",
+}
+
+# Minimum frames between reps at 30 fps, by how fast a rep can realistically
+# be performed; exercises not listed use REP_PEAK_MIN_DISTANCE
+REP_MIN_DISTANCE = {
+    "bicep_curl": 20,
+    "tricep_extension": 20,
+    "shoulder_press": 20,
+    "deadlift": 30,
+}
+REP_PEAK_MIN_DISTANCE = 15
+
+# Minimum rise and fall of the tracking joint per rep (normalized coordinates)
+REP_PEAK_PROMINENCE = 0.05
+
+# Frame-count rep estimate for keypoints that carry no movement to count from
+# (e.g. the mock pose model's static keypoints), as (frame count that must be
+# exceeded, frames per rep); exercises not listed use REP_FALLBACK_DEFAULT
+REP_FALLBACK = {
+    "squat": (10, 30),
+    "bicep_curl": (10, 25),
+    "tricep_extension": (10, 25),
+    "shoulder_press": (10, 25),
+    "lunge": (10, 40),
+}
+REP_FALLBACK_DEFAULT = (-1, 20)
+
+
+def _joint(keypoints: np.ndarray, joint: str, axis: int) -> np.ndarray:
+    """Per-frame coordinate of a joint along one axis"""
+    return keypoints[:, JOINT_INDEX[joint], axis]
+
+
+@dataclass(frozen=True, slots=True)
+class FormRule:
+    """
+    A per-frame form check on the offset between two joints along one axis.
+    
+    A frame is flagged when (joint_a - joint_b), or its magnitude if absolute
+    is set, is above the threshold (or below it when above is False).
+    """
+    joint_a: str
+    joint_b: str
+    axis: int
+    threshold: float
+    error: Dict[str, Any]  # type, severity and message of the FormError raised
+    recommendation: str
+    absolute: bool = False
+    above: bool = True
+    
+    def evaluate(self, keypoints: np.ndarray) -> np.ndarray:
+        """Boolean mask of offending frames"""
+        offset = _joint(keypoints, self.joint_a, self.axis) - _joint(keypoints, self.joint_b, self.axis)
+        if self.absolute:
+            offset = np.abs(offset)
+        return offset > self.threshold if self.above else offset < self.threshold
+
+
+@dataclass(frozen=True, slots=True)
+class FormError:
+    """
+    A form error detected in one frame.
+    
+    orjson serializes it as {"type", "severity", "message", "frame_idx"}, the
+    same shape as the dicts it replaces.
+    """
+    type: str
+    severity: float
+    message: str
+    frame_idx: int
+
+
+_severity = attrgetter("severity")
+
+
+# Form checks per exercise, evaluated in order by DetectFormErrorsTool
+FORM_RULES: Dict[str, Tuple[FormRule, ...]] = {
+    "squat": (
+        # Check for knee valgus
+        FormRule(
+            "left_knee", "left_ankle", X, 0.1,
+            {
+                "type": "knee_valgus",
+                "severity": 0.7,
+                "message": "Knees tracking inward - keep them aligned with ankles"
+            },
+            "Focus on pushing knees out over toes",
+            absolute=True
+        ),
+    ),
+    "pushup": (
+        # Check for torso sag
+        FormRule(
+            "left_hip", "left_shoulder", Y, 0.15,
+            {
+                "type": "torso_sag",
+                "severity": 0.6,
+                "message": "Torso sagging - engage core and maintain straight line"
+            },
+            "Tighten your core and keep your body straight"
+        ),
+    ),
+    "bicep_curl": (
+        # Check if elbow is moving forward (swinging)
+        FormRule(
+            "left_elbow", "left_shoulder", X, 0.2,
+            {
+                "type": "elbow_swing",
+                "severity": 0.65,
+                "message": "Elbows moving forward - keep them close to your body"
+            },
+            "Control the weight, avoid swinging",
+            absolute=True
+        ),
+    ),
+    "tricep_extension": (
+        # Upper arm should stay relatively stationary
+        FormRule(
+            "left_elbow", "left_shoulder", Y, 0.05,
+            {
+                "type": "upper_arm_movement",
+                "severity": 0.6,
+                "message": "Upper arm moving - keep it stationary"
+            },
+            "Lock your upper arm in place",
+            absolute=True,
+            above=False
+        ),
+    ),
+    "chest_press": (
+        # Elbows should not flare out too much
+        FormRule(
+            "left_elbow", "left_shoulder", X, 0.3,
+            {
+                "type": "elbow_flare",
+                "severity": 0.7,
+                "message": "Elbows flaring out - keep them at 45-60 degrees"
+            },
+            "Keep elbows closer to body",
+            absolute=True
+        ),
+    ),
+    "shoulder_press": (
+        # Shoulders should not be too far back
+        FormRule(
+            "left_shoulder", "left_hip", X, -0.1,
+            {
+                "type": "back_arch",
+                "severity": 0.65,
+                "message": "Excessive back arch - engage core"
+            },
+            "Keep core tight and avoid arching",
+            above=False
+        ),
+    ),
+    "lunge": (
+        # Knee should be over ankle
+        FormRule(
+            "left_knee", "left_ankle", X, 0.15,
+            {
+                "type": "knee_position",
+                "severity": 0.7,
+                "message": "Knee not aligned with ankle - step forward more"
+            },
+            "Keep front knee over ankle",
+            absolute=True
+        ),
+    ),
+    "plank": (
+        # Hips should be in line with shoulders; the two checks are exclusive
+        FormRule(
+            "left_hip", "left_shoulder", Y, 0.1,
+            {
+                "type": "hip_sag",
+                "severity": 0.7,
+                "message": "Hips sagging - engage core and glutes"
+            },
+            "Tighten core and squeeze glutes"
+        ),
+        FormRule(
+            "left_hip", "left_shoulder", Y, -0.1,
+            {
+                "type": "hip_raised",
+                "severity": 0.6,
+                "message": "Hips too high - lower to straight line"
+            },
+            "Lower hips to align with shoulders",
+            above=False
+        ),
+    ),
+    "row": (
+        # Elbows should pull back, not just up
+        FormRule(
+            "left_elbow", "left_shoulder", X, 0.1,
+            {
+                "type": "shoulder_retraction",
+                "severity": 0.65,
+                "message": "Not retracting shoulder blades - pull elbows back"
+            },
+            "Squeeze shoulder blades together"
+        ),
+    ),
+}
+
+
+_ANALYZE_POSE_PARAMS = {
+    "frames": "Batch of video frames: a list of images or one stacked (N, H, W, C) array",
+    "model": "Pose model to use (mediapipe, movenet)"
+}
+
+
 class AnalyzePoseTool(BaseTool):
-    """Analyze pose from a single frame"""
+    """Analyze pose for a batch of frames"""
+    
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
             name="analyze_pose",
-            description="Extract pose keypoints from a video frame",
-            parameters={
-                "frame": "Video frame (numpy array or image)",
-                "model": "Pose model to use (mediapipe, movenet)"
-            }
+            description="Extract pose keypoints from a batch of video frames",
+            parameters=_ANALYZE_POSE_PARAMS
         )
     
     async def execute(
@@ -29,43 +334,53 @@ class AnalyzePoseTool(BaseTool):
         parameters: Dict[str, Any],
         context: OrchestrationContext
     ) -> Dict[str, Any]:
-        """Extract keypoints from frame"""
-        frame = parameters.get("frame")
+        """
+        Extract keypoints from all frames in one call.
+        
+        The whole batch goes through the model at once and comes back as a
+        single (N_frames, N_joints, 4) array that downstream tools consume
+        directly, so there is no per-frame tool call or dict unpacking.
+        """
+        frames = parameters.get("frames", ())
         model = parameters.get("model", "mediapipe")
+        frame_count = len(frames)
         
-        # Placeholder: In production, call MediaPipe/MoveNet here
-        # For MVP, return mock keypoints
-        keypoints = {
-            "left_shoulder": {"x": 0.3, "y": 0.2, "z": 0.0, "visibility": 0.9},
-            "right_shoulder": {"x": 0.7, "y": 0.2, "z": 0.0, "visibility": 0.9},
-            "left_elbow": {"x": 0.25, "y": 0.4, "z": 0.0, "visibility": 0.85},
-            "right_elbow": {"x": 0.75, "y": 0.4, "z": 0.0, "visibility": 0.85},
-            "left_hip": {"x": 0.35, "y": 0.5, "z": 0.0, "visibility": 0.9},
-            "right_hip": {"x": 0.65, "y": 0.5, "z": 0.0, "visibility": 0.9},
-            "left_knee": {"x": 0.35, "y": 0.7, "z": 0.0, "visibility": 0.85},
-            "right_knee": {"x": 0.65, "y": 0.7, "z": 0.0, "visibility": 0.85},
-            "left_ankle": {"x": 0.35, "y": 0.9, "z": 0.0, "visibility": 0.8},
-            "right_ankle": {"x": 0.65, "y": 0.9, "z": 0.0, "visibility": 0.8},
-        }
+        # Placeholder: In production, run batched MediaPipe/MoveNet inference here
+        # For MVP, return the read-only mock template broadcast to every frame
+        keypoints = np.broadcast_to(_MOCK_KEYPOINTS, (frame_count,) + _MOCK_KEYPOINTS.shape)
         
         return {
             "keypoints": keypoints,
+            "joint_names": JOINT_NAMES,
             "model": model,
-            "frame_timestamp": context.timestamp.isoformat()
+            "frame_count": frame_count,
+            "frame_timestamp": context.timestamp_iso
         }
 
 
+# Long sequences are checked on every FORM_CHECK_STRIDE-th frame; form errors
+# persist across many consecutive frames, so sampling loses little
+LONG_SEQUENCE_FRAMES = 90
+FORM_CHECK_STRIDE = 3
+
+
+_DETECT_FORM_ERRORS_PARAMS = {
+    "keypoints": "Keypoint array of shape (N_frames, N_joints, 4)",
+    "stride": "Optional frame sampling stride, at least 1 (default 1, or 3 for long sequences)",
+    "exercise_type": "Type of exercise (squat, pushup, deadlift)"
+}
+
+
 class DetectFormErrorsTool(BaseTool):
     """Detect form errors based on keypoints"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="detect_form_errors",
             description="Detect exercise form errors from keypoint sequences",
-            parameters={
-                "keypoints_list": "List of keypoint dictionaries",
-                "exercise_type": "Type of exercise (squat, pushup, deadlift)"
-            }
+            parameters=_DETECT_FORM_ERRORS_PARAMS
         )
     
     async def execute(
@@ -74,184 +389,117 @@ class DetectFormErrorsTool(BaseTool):
         context: OrchestrationContext
     ) -> Dict[str, Any]:
         """Detect form errors"""
-        keypoints_list = parameters.get("keypoints_list", [])
+        raw_keypoints = parameters.get("keypoints", ())
         exercise_type = parameters.get("exercise_type", "squat")
+        rules = FORM_RULES.get(exercise_type, ())
         
+        # Nothing to check: skip packing and ranking entirely
+        if not rules or len(raw_keypoints) == 0:
+            return {
+                "errors": [],
+                "top_errors": [],
+                "recommendations": [],
+                "stride": 1,
+                "exercise_type": exercise_type
+            }
+        
+        stride = parameters.get("stride")
+        if stride is None:
+            stride = FORM_CHECK_STRIDE if len(raw_keypoints) >= LONG_SEQUENCE_FRAMES else 1
+        stride = int(stride)
+        if stride < 1:
+            raise ValueError(f"stride must be at least 1, got {stride}")
+        keypoints = get_or_pack_keypoints(context, raw_keypoints)[::stride]
         errors = []
         recommendations = []
         
-        if exercise_type == "squat":
-            # Check for knee valgus
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_knee = keypoints.get("left_knee", {})
-                left_ankle = keypoints.get("left_ankle", {})
-                
-                if abs(left_knee.get("x", 0) - left_ankle.get("x", 0)) > 0.1:
-                    errors.append({
-                        "type": "knee_valgus",
-                        "severity": 0.7,
-                        "message": "Knees tracking inward - keep them aligned with ankles"
-                    })
-                    recommendations.append("Focus on pushing knees out over toes")
-        
-        elif exercise_type == "pushup":
-            # Check for torso sag
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_shoulder = keypoints.get("left_shoulder", {})
-                left_hip = keypoints.get("left_hip", {})
-                
-                if left_hip.get("y", 0) - left_shoulder.get("y", 0) > 0.15:
-                    errors.append({
-                        "type": "torso_sag",
-                        "severity": 0.6,
-                        "message": "Torso sagging - engage core and maintain straight line"
-                    })
-                    recommendations.append("Tighten your core and keep your body straight")
-        
-        elif exercise_type == "bicep_curl":
-            # Check for elbow movement and swinging
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_elbow = keypoints.get("left_elbow", {})
-                left_shoulder = keypoints.get("left_shoulder", {})
-                
-                # Check if elbow is moving forward (swinging)
-                if abs(left_elbow.get("x", 0) - left_shoulder.get("x", 0)) > 0.2:
-                    errors.append({
-                        "type": "elbow_swing",
-                        "severity": 0.65,
-                        "message": "Elbows moving forward - keep them close to your body"
-                    })
-                    recommendations.append("Control the weight, avoid swinging")
-        
-        elif exercise_type == "tricep_extension":
-            # Check for upper arm movement
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_elbow = keypoints.get("left_elbow", {})
-                left_shoulder = keypoints.get("left_shoulder", {})
-                
-                # Upper arm should stay relatively stationary
-                if abs(left_elbow.get("y", 0) - left_shoulder.get("y", 0)) < 0.05:
-                    errors.append({
-                        "type": "upper_arm_movement",
-                        "severity": 0.6,
-                        "message": "Upper arm moving - keep it stationary"
-                    })
-                    recommendations.append("Lock your upper arm in place")
-        
-        elif exercise_type == "chest_press":
-            # Check for shoulder blade position
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_shoulder = keypoints.get("left_shoulder", {})
-                left_elbow = keypoints.get("left_elbow", {})
-                
-                # Elbows should not flare out too much
-                if abs(left_elbow.get("x", 0) - left_shoulder.get("x", 0)) > 0.3:
-                    errors.append({
-                        "type": "elbow_flare",
-                        "severity": 0.7,
-                        "message": "Elbows flaring out - keep them at 45-60 degrees"
-                    })
-                    recommendations.append("Keep elbows closer to body")
-        
-        elif exercise_type == "shoulder_press":
-            # Check for excessive back arch
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_shoulder = keypoints.get("left_shoulder", {})
-                left_hip = keypoints.get("left_hip", {})
-                
-                # Shoulders should not be too far back
-                if left_shoulder.get("x", 0) < left_hip.get("x", 0) - 0.1:
-                    errors.append({
-                        "type": "back_arch",
-                        "severity": 0.65,
-                        "message": "Excessive back arch - engage core"
-                    })
-                    recommendations.append("Keep core tight and avoid arching")
-        
-        elif exercise_type == "lunge":
-            # Check for knee position
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_knee = keypoints.get("left_knee", {})
-                left_ankle = keypoints.get("left_ankle", {})
-                
-                # Knee should be over ankle
-                if abs(left_knee.get("x", 0) - left_ankle.get("x", 0)) > 0.15:
-                    errors.append({
-                        "type": "knee_position",
-                        "severity": 0.7,
-                        "message": "Knee not aligned with ankle - step forward more"
-                    })
-                    recommendations.append("Keep front knee over ankle")
-        
-        elif exercise_type == "plank":
-            # Check for hip position
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_shoulder = keypoints.get("left_shoulder", {})
-                left_hip = keypoints.get("left_hip", {})
-                left_knee = keypoints.get("left_knee", {})
-                
-                # Hips should be in line with shoulders
-                if left_hip.get("y", 0) > left_shoulder.get("y", 0) + 0.1:
-                    errors.append({
-                        "type": "hip_sag",
-                        "severity": 0.7,
-                        "message": "Hips sagging - engage core and glutes"
-                    })
-                    recommendations.append("Tighten core and squeeze glutes")
-                elif left_hip.get("y", 0) < left_shoulder.get("y", 0) - 0.1:
-                    errors.append({
-                        "type": "hip_raised",
-                        "severity": 0.6,
-                        "message": "Hips too high - lower to straight line"
-                    })
-                    recommendations.append("Lower hips to align with shoulders")
-        
-        elif exercise_type == "row":
-            # Check for shoulder blade retraction
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_shoulder = keypoints.get("left_shoulder", {})
-                left_elbow = keypoints.get("left_elbow", {})
-                
-                # Elbows should pull back, not just up
-                if left_elbow.get("x", 0) > left_shoulder.get("x", 0) + 0.1:
-                    errors.append({
-                        "type": "shoulder_retraction",
-                        "severity": 0.65,
-                        "message": "Not retracting shoulder blades - pull elbows back"
-                    })
-                    recommendations.append("Squeeze shoulder blades together")
+        for rule in rules:
+            frame_indices = np.flatnonzero(rule.evaluate(keypoints))
+            if frame_indices.size:
+                # Report indices in the original, unsampled sequence
+                frame_indices *= stride
+                error_type, severity, message = rule.error["type"], rule.error["severity"], rule.error["message"]
+                errors.extend(FormError(error_type, severity, message, i) for i in frame_indices.tolist())
+                recommendations.append(rule.recommendation)
         
         # Get top errors by severity
-        top_errors = sorted(errors, key=lambda x: x.get("severity", 0), reverse=True)[:3]
+        top_errors = heapq.nlargest(3, errors, key=_severity)
         
         return {
             "errors": errors,
             "top_errors": top_errors,
-            "recommendations": list(set(recommendations)),
+            "recommendations": list(dict.fromkeys(recommendations)),
+            "stride": stride,
             "exercise_type": exercise_type
         }
 
 
+def _count_knee_reps(keypoints: np.ndarray, exercise_type: str) -> int:
+    """
+    One rep per knee bend: angle drops below the down threshold, then
+    extends back past the up threshold.
+    """
+    knee_angles = compute_joint_angles(
+        keypoints,
+        JOINT_INDEX["left_hip"],
+        JOINT_INDEX["left_knee"],
+        JOINT_INDEX["left_ankle"]
+    )
+    down_threshold, up_threshold = KNEE_REP_THRESHOLDS[exercise_type]
+    return int(count_reps_from_angle(knee_angles, down_threshold, up_threshold))
+
+
+def _count_held_reps(keypoints: np.ndarray, exercise_type: str) -> int:
+    """Time-based exercises are held, not repeated"""
+    return 0
+
+
+def _count_position_reps(keypoints: np.ndarray, exercise_type: str) -> int:
+    """One rep per up-down cycle of the tracking joint's height"""
+    signal = _joint(keypoints, REP_SIGNAL_JOINTS.get(exercise_type, "left_hip"), Y)
+    return int(count_peaks(
+        np.ascontiguousarray(signal),
+        REP_MIN_DISTANCE.get(exercise_type, REP_PEAK_MIN_DISTANCE),
+        REP_PEAK_PROMINENCE
+    ))
+
+
+def _has_motion(keypoints: np.ndarray) -> bool:
+    """Whether any joint moves by at least REP_PEAK_PROMINENCE across the frames"""
+    if keypoints.shape[0] < 2:
+        return False
+    return float(np.ptp(keypoints[..., :2], axis=0).max()) >= REP_PEAK_PROMINENCE
+
+
+def _estimate_reps_from_frames(frame_count: int, exercise_type: str) -> int:
+    """Frame-count rep estimate used when there is no movement signal"""
+    min_frames, frames_per_rep = REP_FALLBACK.get(exercise_type, REP_FALLBACK_DEFAULT)
+    return max(1, frame_count // frames_per_rep) if frame_count > min_frames else 0
+
+
+# Rep counter per exercise; unlisted exercises use _count_position_reps
+REP_COUNTERS: Dict[str, Callable[[np.ndarray, str], int]] = {
+    **{exercise: _count_knee_reps for exercise in KNEE_REP_THRESHOLDS},
+    "plank": _count_held_reps,
+}
+
+
+_COUNT_REPS_PARAMS = {
+    "keypoints": "Keypoint array of shape (N_frames, N_joints, 4)",
+    "exercise_type": "Type of exercise"
+}
+
+
 class CountRepsTool(BaseTool):
     """Count repetitions from keypoint sequence"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="count_reps",
             description="Count exercise repetitions from keypoint sequence",
-            parameters={
-                "keypoints_list": "List of keypoint dictionaries",
-                "exercise_type": "Type of exercise"
-            }
+            parameters=_COUNT_REPS_PARAMS
         )
     
     async def execute(
@@ -260,76 +508,45 @@ class CountRepsTool(BaseTool):
         context: OrchestrationContext
     ) -> Dict[str, Any]:
         """Count reps"""
-        keypoints_list = parameters.get("keypoints_list", [])
+        keypoints = get_or_pack_keypoints(context, parameters.get("keypoints", ()))
         exercise_type = parameters.get("exercise_type", "squat")
+        frame_count = keypoints.shape[0]
         
         # Rep counting based on exercise type
-        if exercise_type == "squat":
-            hip_heights = []
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_hip = keypoints.get("left_hip", {})
-                hip_heights.append(left_hip.get("y", 0.5))
-            
-            # Count peaks (lowest points = bottom of squat)
-            if len(hip_heights) > 10:
-                rep_count = max(1, len(hip_heights) // 30)
-            else:
-                rep_count = 0
-        
-        elif exercise_type in ["bicep_curl", "tricep_extension", "shoulder_press"]:
-            # Count based on arm movement cycles
-            elbow_positions = []
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_elbow = keypoints.get("left_elbow", {})
-                elbow_positions.append(left_elbow.get("y", 0.5))
-            
-            if len(elbow_positions) > 10:
-                rep_count = max(1, len(elbow_positions) // 25)
-            else:
-                rep_count = 0
-        
-        elif exercise_type == "lunge":
-            # Count based on hip movement
-            hip_heights = []
-            for kp in keypoints_list:
-                keypoints = kp.get("keypoints", {})
-                left_hip = keypoints.get("left_hip", {})
-                hip_heights.append(left_hip.get("y", 0.5))
-            
-            if len(hip_heights) > 10:
-                rep_count = max(1, len(hip_heights) // 40)
-            else:
-                rep_count = 0
-        
-        elif exercise_type == "plank":
-            # Plank is time-based, not rep-based
-            rep_count = 0  # Planks are held, not repeated
-        
-        else:
-            # Generic rep counting for other exercises
-            rep_count = max(1, len(keypoints_list) // 20)
+        counter = REP_COUNTERS.get(exercise_type, _count_position_reps)
+        rep_count = counter(keypoints, exercise_type)
+        if rep_count == 0 and counter is not _count_held_reps and not _has_motion(keypoints):
+            rep_count = _estimate_reps_from_frames(frame_count, exercise_type)
         
         return {
             "rep_count": rep_count,
             "exercise_type": exercise_type,
-            "frames_analyzed": len(keypoints_list)
+            "frames_analyzed": frame_count
         }
 
 
+# Minimum score for each grade above the lowest, ascending
+FORM_GRADE_THRESHOLDS = (60, 75, 90)
+FORM_GRADES = ("Needs Improvement", "Fair", "Good", "Excellent")
+
+
+_CALCULATE_FORM_SCORE_PARAMS = {
+    "form_errors": "detect_form_errors result (FormError records, sampled every stride frames)",
+    "rep_count": "Number of repetitions",
+    "exercise_type": "Type of exercise"
+}
+
+
 class CalculateFormScoreTool(BaseTool):
     """Calculate overall form score"""
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__(
             name="calculate_form_score",
             description="Calculate overall exercise form score",
-            parameters={
-                "form_errors": "Dictionary of detected form errors",
-                "rep_count": "Number of repetitions",
-                "exercise_type": "Type of exercise"
-            }
+            parameters=_CALCULATE_FORM_SCORE_PARAMS
         )
     
     async def execute(
@@ -343,29 +560,23 @@ class CalculateFormScoreTool(BaseTool):
         exercise_type = parameters.get("exercise_type", "squat")
         
         errors = form_errors.get("errors", [])
+        # Each sampled error frame stands for stride frames of the sequence, so
+        # scores do not jump when long sequences switch to sampling
+        stride = form_errors.get("stride", 1)
         
         # Calculate score based on errors
-        base_score = 100.0
-        for error in errors:
-            severity = error.get("severity", 0.5)
-            base_score -= severity * 10
+        severities = np.fromiter(
+            (error.severity for error in errors), dtype=np.float64, count=len(errors)
+        )
+        base_score = 100.0 - float(severities.sum()) * stride * 10
         
         overall_score = max(0, min(100, base_score))
-        
-        # Grade
-        if overall_score >= 90:
-            grade = "Excellent"
-        elif overall_score >= 75:
-            grade = "Good"
-        elif overall_score >= 60:
-            grade = "Fair"
-        else:
-            grade = "Needs Improvement"
+        grade = FORM_GRADES[bisect_right(FORM_GRADE_THRESHOLDS, overall_score)]
         
         return {
             "overall_score": round(overall_score, 1),
             "grade": grade,
-            "error_count": len(errors),
+            "error_count": len(errors) * stride,
             "rep_count": rep_count,
             "exercise_type": exercise_type
         }
@@ -5,7 +5,7 @@ Central registry for all tools in the system, allowing agents to discover
 and use tools dynamically.
 """
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from .base import BaseTool
 import logging
 
@@ -19,7 +19,12 @@ class ToolRegistry:
     
     def __init__(self):
         self._tools: Dict[str, BaseTool] = {}
-        self._tools_by_category: Dict[str, List[str]] = {}
+        # Tools per category by name, in registration order
+        self._tools_by_category: Dict[str, Dict[str, BaseTool]] = {}
+        # Bumped on every register; listings are rebuilt only when it changes
+        self._version = 0
+        self._listing_version = -1
+        self._listing: Tuple[Tuple[str, ...], Tuple[BaseTool, ...]] = ((), ())
     
     def register(self, tool: BaseTool, category: Optional[str] = None) -> None:
         """
@@ -31,14 +36,16 @@ class ToolRegistry:
         """
         if tool.name in self._tools:
             logger.warning(f"Tool {tool.name} already registered, overwriting")
+            for category_tools in self._tools_by_category.values():
+                if tool.name in category_tools:
+                    category_tools[tool.name] = tool
         
         self._tools[tool.name] = tool
         
         if category:
-            if category not in self._tools_by_category:
-                self._tools_by_category[category] = []
-            if tool.name not in self._tools_by_category[category]:
-                self._tools_by_category[category].append(tool.name)
+            self._tools_by_category.setdefault(category, {})[tool.name] = tool
+        
+        self._version += 1
         
         logger.info(f"Registered tool {tool.name} (category: {category or 'none'})")
     
@@ -48,12 +55,19 @@ class ToolRegistry:
     
     def get_tools_by_category(self, category: str) -> List[BaseTool]:
         """Get all tools in a category"""
-        tool_names = self._tools_by_category.get(category, [])
-        return [self._tools[name] for name in tool_names if name in self._tools]
+        category_tools = self._tools_by_category.get(category)
+        return list(category_tools.values()) if category_tools else []
+    
+    def _get_listing(self) -> Tuple[Tuple[str, ...], Tuple[BaseTool, ...]]:
+        """Registered (names, tools), rebuilt only after a registration"""
+        if self._listing_version != self._version:
+            self._listing = (tuple(self._tools), tuple(self._tools.values()))
+            self._listing_version = self._version
+        return self._listing
     
     def list_tools(self) -> List[str]:
         """List all registered tool names"""
-        return list(self._tools.keys())
+        return list(self._get_listing()[0])
     
     def get_tool_info(self, name: str) -> Optional[Dict]:
         """Get information about a tool"""
@@ -64,5 +78,6 @@ class ToolRegistry:
     
     def list_all_tool_info(self) -> List[Dict]:
         """Get information about all tools"""
-        return [tool.get_info() for tool in self._tools.values()]
+        # Static tool info is prebuilt per tool; only execution counts are read live
+        return [tool.get_info() for tool in self._get_listing()[1]]
 
@@ -0,0 +1,181 @@
+import base64
+
+import cv2
+import numpy as np
+import orjson
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.main import MAX_FRAMES_PER_REQUEST, WS_FRAME_HEADER, BodySizeLimitMiddleware, app
+
+
+def _jpeg_bytes():
+    return cv2.imencode(".jpg", np.zeros((48, 64, 3), np.uint8))[1].tobytes()
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="module")
+def video_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("video") / "clip.avi"
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+    for i in range(45):
+        writer.write(np.full((48, 64, 3), i * 5, np.uint8))
+    writer.release()
+    return path
+
+
+def test_pose_infer(client):
+    frame = base64.b64encode(_jpeg_bytes()).decode()
+    response = client.post("/api/v1/pose/infer", json={"frames": [frame] * 3, "exercise_type": "squat"})
+    
+    assert response.status_code == 200
+
+
+def test_pose_infer_rejects_empty_frame(client):
+    response = client.post("/api/v1/pose/infer", json={"frames": [""], "exercise_type": "squat"})
+    
+    assert response.status_code == 400
+
+
+def test_pose_infer_rejects_unknown_coaching_context(client):
+    frame = base64.b64encode(_jpeg_bytes()).decode()
+    response = client.post(
+        "/api/v1/pose/infer",
+        json={"frames": [frame], "exercise_type": "squat", "coaching_context": "bogus"}
+    )
+    
+    assert response.status_code == 422
+
+
+def test_pose_upload(client):
+    files = [("files", (f"frame{i}.jpg", _jpeg_bytes(), "image/jpeg")) for i in range(3)]
+    response = client.post("/api/v1/pose/infer/upload", files=files, data={"exercise_type": "squat"})
+    
+    assert response.status_code == 200
+
+
+@pytest.mark.parametrize("content", [b"", b"not an image"])
+def test_pose_upload_rejects_bad_file(client, content):
+    files = [("files", ("frame.jpg", content, "image/jpeg"))]
+    response = client.post("/api/v1/pose/infer/upload", files=files, data={"exercise_type": "squat"})
+    
+    assert response.status_code == 400
+
+
+def test_analyze_video(client, video_path):
+    with open(video_path, "rb") as f:
+        response = client.post(
+            "/api/v1/pose/analyze_video",
+            files={"video": ("clip.avi", f, "video/x-msvideo")},
+            data={"exercise_type": "squat"}
+        )
+    
+    assert response.status_code == 200
+
+
+def test_analyze_video_rejects_garbage(client):
+    response = client.post(
+        "/api/v1/pose/analyze_video",
+        files={"video": ("clip.mp4", b"not a video", "video/mp4")},
+        data={"exercise_type": "squat"}
+    )
+    
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("endpoint", ["/api/v1/pose/infer", "/api/v1/pose/infer/upload"])
+def test_pose_endpoints_reject_too_many_frames(client, endpoint):
+    frame_count = MAX_FRAMES_PER_REQUEST + 1
+    if endpoint.endswith("upload"):
+        files = [("files", (f"frame{i}.jpg", _jpeg_bytes(), "image/jpeg")) for i in range(frame_count)]
+        response = client.post(endpoint, files=files, data={"exercise_type": "squat"})
+    else:
+        frame = base64.b64encode(_jpeg_bytes()).decode()
+        response = client.post(endpoint, json={"frames": [frame] * frame_count, "exercise_type": "squat"})
+    
+    assert response.status_code == 422
+
+
+def _limited_app(**limits):
+    limited = FastAPI()
+    
+    @limited.post("/small")
+    async def small(payload: dict):
+        return payload
+    
+    @limited.post("/large")
+    async def large(payload: dict):
+        return payload
+    
+    limited.add_middleware(BodySizeLimitMiddleware, **limits)
+    return limited
+
+
+def test_body_size_limit():
+    with TestClient(_limited_app(max_bytes=64)) as test_client:
+        assert test_client.post("/small", json={"data": "x" * 200}).status_code == 413
+        assert test_client.post("/small", json={"data": "x"}).status_code == 200
+
+
+def test_body_size_limit_per_path():
+    body = {"data": "x" * 200}
+    
+    with TestClient(_limited_app(max_bytes=64, path_limits={"/large": 1024})) as test_client:
+        assert test_client.post("/small", json=body).status_code == 413
+        assert test_client.post("/large", json=body).status_code == 200
+
+
+def test_websocket_binary_and_json_frames(client):
+    jpeg = _jpeg_bytes()
+    user_id = b"user-1"
+    
+    with client.websocket_connect("/ws/pose") as ws:
+        ws.send_bytes(WS_FRAME_HEADER.pack(1, 0, len(user_id), 42, 0) + user_id + jpeg)
+        response = orjson.loads(ws.receive_text())
+        assert response["success"] is True
+        assert response["sequence"] == 42
+        
+        ws.send_text(orjson.dumps({"frame": base64.b64encode(jpeg).decode(), "exercise_type": "plank"}).decode())
+        assert orjson.loads(ws.receive_text())["success"] is True
+
+
+@pytest.mark.parametrize("message", [
+    WS_FRAME_HEADER.pack(1, 0, 0, 7, 0),
+    b"\x01\x63" + b"\0" * 14,
+    '{"exercise_type": "squat"}',
+    '{"frame": "xx"}',
+    "[1]",
+])
+def test_websocket_reports_malformed_frames(client, message):
+    with client.websocket_connect("/ws/pose") as ws:
+        if isinstance(message, bytes):
+            ws.send_bytes(message)
+        else:
+            ws.send_text(message)
+        response = orjson.loads(ws.receive_text())
+        
+        assert response["success"] is False
+        assert response["error"]
+
+
+def test_mindfulness_without_mood_hint(client):
+    request = {"context": "general", "session_id": "mind-session", "user_id": "mind-user"}
+    
+    assert client.post("/api/v1/mind/short", json=request).status_code == 200
+    assert client.post("/api/v1/mind/short", json=request).status_code == 200
+
+
+def test_pose_keypoints_wire_format(client):
+    frame = base64.b64encode(_jpeg_bytes()).decode()
+    response = client.post("/api/v1/pose/infer", json={"frames": [frame] * 2, "exercise_type": "squat"})
+    pose = response.json()["pose_analysis"]
+    
+    assert len(pose["keypoints"]) == 2
+    assert len(pose["keypoints"][0]) == len(pose["joint_names"])
+    assert all(len(joint) == 4 for joint in pose["keypoints"][0])
@@ -0,0 +1,37 @@
+from app.guardrails.validator import GuardrailValidator
+from app.orchestration.context import OrchestrationContext
+
+
+def test_scan_finds_keywords_in_nested_payload():
+    validator = GuardrailValidator()
+    report = validator.scan({"notes": ["this may cure your back pain"], "frames": None})
+    
+    assert report.medical_keyword == "cure"
+    assert report.self_harm_keyword is None
+
+
+def test_scan_cache_is_kept_per_keyword_configuration():
+    context = OrchestrationContext("test-session")
+    payload = {"text": "try a handstand today"}
+    default = GuardrailValidator()
+    strict = GuardrailValidator(dangerous_exercise_keywords=["handstand"])
+    
+    assert default.scan(payload, context).dangerous_keyword is None
+    # A validator with other keywords must not reuse the cached clean result
+    assert strict.scan(payload, context).dangerous_keyword == "handstand"
+    assert default.scan(payload, context).dangerous_keyword is None
+
+
+def test_instance_is_shared_per_configuration():
+    assert GuardrailValidator.instance() is GuardrailValidator.instance()
+    assert GuardrailValidator.instance() is not GuardrailValidator.instance(medical_keywords=["x"])
+
+
+def test_sanitize_output_leaves_binary_fields_untouched():
+    validator = GuardrailValidator()
+    frame = "this frame may cure. aGVsbG8="
+    output = {"frame": frame, "notes": "This may cure your back pain. Keep your back straight"}
+    sanitized = validator.sanitize_output(output)
+    
+    assert sanitized["frame"] == frame
+    assert "cure" not in sanitized["notes"]
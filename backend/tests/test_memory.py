@@ -0,0 +1,59 @@
+import asyncio
+
+from app.memory.manager import MemoryManager
+
+
+def _store(memory, session_id, user_id=None, agent="pose", **task):
+    asyncio.run(memory.store_interaction(session_id, user_id, agent, task, {"ok": True}))
+
+
+def _context(memory, session_id, user_id=None, agent=None):
+    return asyncio.run(memory.get_context(session_id, user_id=user_id, agent=agent))
+
+
+def test_stored_task_drops_media_and_memory_keys():
+    memory = MemoryManager()
+    _store(memory, "s1", frames=[b"jpeg"], session_history=[], exercise_type="squat")
+    
+    assert memory.session_memory["s1"][0].task == {"exercise_type": "squat"}
+
+
+def test_context_cache_invalidated_by_new_interaction():
+    memory = MemoryManager()
+    _store(memory, "s1", exercise_type="squat")
+    first = _context(memory, "s1")
+    
+    assert _context(memory, "s1") is first
+    _store(memory, "s1", exercise_type="lunge")
+    assert len(_context(memory, "s1")["session_history"]) == 2
+
+
+def test_clear_session_prunes_state_and_invalidates_context():
+    memory = MemoryManager()
+    _store(memory, "s1", user_id="u1", exercise_type="squat")
+    assert _context(memory, "s1")["session_history"]
+    
+    memory.clear_session("s1")
+    
+    assert ("session", "s1") not in memory._generations
+    assert "s1" not in memory._session_versions
+    assert _context(memory, "s1")["session_history"] == []
+
+
+def test_clear_user_memory_invalidates_context():
+    memory = MemoryManager()
+    _store(memory, "s1", user_id="u1", exercise_type="squat")
+    assert _context(memory, "s2", user_id="u1")["user_history"]
+    
+    memory.clear_user_memory("u1")
+    
+    assert "user_history" not in _context(memory, "s2", user_id="u1")
+
+
+def test_mindfulness_result_without_mood_analysis():
+    memory = MemoryManager()
+    asyncio.run(memory.store_interaction(
+        "s1", "u1", "mindfulness", {"context": "general"}, {"mood_analysis": None}
+    ))
+    
+    assert _context(memory, "s1", user_id="u1")["user_history"]
@@ -0,0 +1,30 @@
+import asyncio
+
+import pytest
+
+from app.orchestration.context import OrchestrationContext
+from app.tools.nutrition_tools import BATCH_VECTORIZE_MIN, CalculateNutritionTool
+
+
+@pytest.mark.parametrize("count", [3, BATCH_VECTORIZE_MIN, BATCH_VECTORIZE_MIN * 3])
+def test_execute_batch_matches_execute(count):
+    tool = CalculateNutritionTool()
+    context = OrchestrationContext("test-session")
+    foods = ["grilled_chicken", "fries", "burger", "salad", "unknown_food"]
+    items = [
+        {
+            "food_class": foods[i % len(foods)],
+            "portion_grams": 37 + i * 13,
+            "confidence": 0.35 + (i % 7) * 0.09
+        }
+        for i in range(count)
+    ]
+    
+    async def run():
+        batch = await tool.execute_batch(items, context)
+        scalar = [await tool.execute(item, context) for item in items]
+        return batch, scalar
+    
+    batch, scalar = asyncio.run(run())
+    
+    assert batch == scalar
@@ -0,0 +1,79 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from app.orchestration.context import OrchestrationContext
+from app.tools.pose_tools import (
+    _MOCK_KEYPOINTS,
+    JOINT_INDEX,
+    LONG_SEQUENCE_FRAMES,
+    CalculateFormScoreTool,
+    CountRepsTool,
+    DetectFormErrorsTool,
+)
+
+
+def _count_reps(keypoints, exercise_type):
+    context = OrchestrationContext("test-session")
+    result = asyncio.run(
+        CountRepsTool().execute({"keypoints": keypoints, "exercise_type": exercise_type}, context)
+    )
+    return result["rep_count"]
+
+
+def _mock_frames(frame_count):
+    return np.broadcast_to(_MOCK_KEYPOINTS, (frame_count,) + _MOCK_KEYPOINTS.shape)
+
+
+@pytest.mark.parametrize("exercise_type, frame_count, expected", [
+    ("squat", 60, 2),
+    ("squat", 10, 0),
+    ("bicep_curl", 50, 2),
+    ("shoulder_press", 11, 1),
+    ("lunge", 80, 2),
+    ("plank", 90, 0),
+    ("pushup", 60, 3),
+    ("pushup", 5, 1),
+])
+def test_static_keypoints_use_frame_count_floor(exercise_type, frame_count, expected):
+    assert _count_reps(_mock_frames(frame_count), exercise_type) == expected
+
+
+def test_moving_keypoints_count_signal_reps():
+    frame_count = 120
+    keypoints = np.array(_mock_frames(frame_count))
+    # Three full up/down cycles of the whole body
+    offset = 0.1 * np.sin(np.linspace(0.0, 6.0 * np.pi, frame_count))
+    keypoints[..., 1] += offset[:, None]
+    
+    assert _count_reps(keypoints, "pushup") == 3
+
+
+def _run(tool, parameters):
+    return asyncio.run(tool.execute(parameters, OrchestrationContext("test-session")))
+
+
+@pytest.mark.parametrize("stride", [0, -1, "0"])
+def test_detect_form_errors_rejects_invalid_stride(stride):
+    with pytest.raises(ValueError):
+        _run(
+            DetectFormErrorsTool(), {"keypoints": _mock_frames(10), "exercise_type": "squat", "stride": stride}
+        )
+
+
+def test_form_score_does_not_jump_when_sampling_starts():
+    keypoints = np.array(_mock_frames(LONG_SEQUENCE_FRAMES))
+    # Knee caving in over the first six frames
+    keypoints[:6, JOINT_INDEX["left_knee"], 0] = 0.5
+    
+    scores = []
+    for stride in (1, None):
+        form_errors = _run(
+            DetectFormErrorsTool(), {"keypoints": keypoints, "exercise_type": "squat", "stride": stride}
+        )
+        scores.append(_run(CalculateFormScoreTool(), {"form_errors": form_errors, "exercise_type": "squat"}))
+    
+    assert scores[0]["error_count"] == 6
+    assert scores[1]["error_count"] == scores[0]["error_count"]
+    assert scores[1]["overall_score"] == scores[0]["overall_score"]
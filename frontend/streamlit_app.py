@@ -8,15 +8,109 @@ import streamlit as st
 import requests
 import json
 import uuid
-from typing import Optional
+import hashlib
+from typing import List, Optional, Tuple
 import cv2
 import numpy as np
-from PIL import Image
+import orjson
 import base64
-from io import BytesIO
+
+try:
+    # simplejpeg: thinner libjpeg-turbo binding than cv2.imencode for frame encoding
+    import simplejpeg
+except (ImportError, ValueError):  # ValueError: built against an incompatible numpy
+    simplejpeg = None
 
 # Configuration
 API_BASE_URL = "http://localhost:8000"
+JPEG_QUALITY = 85
+POSE_FRAME_MAX_SIDE = 480  # Pose models work at <=640px, so larger frames are downscaled
+POSE_JPEG_QUALITY = 80
+STATUS_CACHE_TTL = 5  # Seconds to reuse Session Summary page responses
+MIN_KEYPOINT_VISIBILITY = 0.5  # Joints below this are left out of the overlay
+
+# Joint pairs connected in the pose overlay
+POSE_SKELETON = (
+    ("left_shoulder", "right_shoulder"),
+    ("left_shoulder", "left_elbow"),
+    ("right_shoulder", "right_elbow"),
+    ("left_shoulder", "left_hip"),
+    ("right_shoulder", "right_hip"),
+    ("left_hip", "right_hip"),
+    ("left_hip", "left_knee"),
+    ("right_hip", "right_knee"),
+    ("left_knee", "left_ankle"),
+    ("right_knee", "right_ankle"),
+)
+
+EXERCISES = (
+    "squat", "pushup", "deadlift", "bicep_curl", "tricep_extension",
+    "chest_press", "shoulder_press", "lunge", "plank", "row"
+)
+
+# Form tips shown next to the exercise picker
+EXERCISE_TIPS = {
+    "squat": """
+    **Squat Form Tips:**
+    - Keep knees aligned with ankles
+    - Maintain straight back
+    - Go below parallel for full depth
+    """,
+    "pushup": """
+    **Push-up Form Tips:**
+    - Keep body in straight line
+    - Lower chest to ground
+    - Engage core throughout
+    """,
+    "deadlift": """
+    **Deadlift Form Tips:**
+    - Keep back straight
+    - Hinge at hips
+    - Drive through heels
+    """,
+    "bicep_curl": """
+    **Bicep Curl Form Tips:**
+    - Keep elbows close to body
+    - Control the weight (no swinging)
+    - Full range of motion
+    """,
+    "tricep_extension": """
+    **Tricep Extension Form Tips:**
+    - Keep upper arms stationary
+    - Extend fully at bottom
+    - Control the negative
+    """,
+    "chest_press": """
+    **Chest Press Form Tips:**
+    - Keep shoulder blades retracted
+    - Lower to chest level
+    - Press in controlled motion
+    """,
+    "shoulder_press": """
+    **Shoulder Press Form Tips:**
+    - Keep core engaged
+    - Press straight up
+    - Don't arch back excessively
+    """,
+    "lunge": """
+    **Lunge Form Tips:**
+    - Step forward, not down
+    - Keep front knee over ankle
+    - Maintain upright torso
+    """,
+    "plank": """
+    **Plank Form Tips:**
+    - Keep body in straight line
+    - Engage core and glutes
+    - Don't let hips sag
+    """,
+    "row": """
+    **Row Form Tips:**
+    - Pull to lower chest/upper abs
+    - Squeeze shoulder blades
+    - Keep core engaged
+    """
+}
 
 # Page configuration
 st.set_page_config(
@@ -32,28 +126,139 @@ if "user_id" not in st.session_state:
     st.session_state.user_id = None
 
 
-def encode_image(image: Image.Image) -> str:
-    """Encode PIL image to base64"""
-    buffered = BytesIO()
-    image.save(buffered, format="JPEG")
-    return base64.b64encode(buffered.getvalue()).decode()
+def encode_jpeg(image: np.ndarray, quality: int = JPEG_QUALITY) -> bytes:
+    """Encode a BGR image to JPEG bytes"""
+    if simplejpeg is not None:
+        # 4:2:0 chroma subsampling matches cv2.imencode's output (simplejpeg defaults to 4:4:4)
+        return simplejpeg.encode_jpeg(
+            np.ascontiguousarray(image),
+            quality=quality,
+            colorspace="BGR",
+            colorsubsampling="420"
+        )
+    
+    ok, buffer = cv2.imencode(".jpg", image, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    if not ok:
+        raise ValueError("Could not encode image as JPEG")
+    return buffer.tobytes()
+
+
+def encode_image(image: np.ndarray) -> str:
+    """Encode a BGR image to base64 JPEG"""
+    return base64.b64encode(encode_jpeg(image)).decode("ascii")
 
 
-def call_api(endpoint: str, data: dict) -> dict:
-    """Call API endpoint"""
+def downscale_frame(frame: np.ndarray) -> np.ndarray:
+    """Downscale a BGR frame so its long side fits the pose model input size"""
+    h, w = frame.shape[:2]
+    scale = POSE_FRAME_MAX_SIDE / max(h, w)
+    if scale < 1:
+        frame = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+    return frame
+
+
+def draw_pose(frame: np.ndarray, keypoints: List[List[float]], joint_names: List[str]) -> None:
+    """
+    Draw a pose skeleton and its bounding box onto a BGR frame in place.
+    
+    Args:
+        frame: BGR frame to draw on
+        keypoints: Per-joint [x, y, z, visibility] in normalized image coordinates
+        joint_names: Joint name for each keypoint row
+    """
+    points = np.asarray(keypoints, dtype=np.float32)
+    if points.size == 0:
+        return
+    
+    visible = (points[:, 3] >= MIN_KEYPOINT_VISIBILITY).tolist()
+    if not any(visible):
+        return
+    
+    h, w = frame.shape[:2]
+    pixels = np.rint(points[:, :2] * (w, h)).astype(np.int32)
+    joint_index = {name: i for i, name in enumerate(joint_names)}
+    
+    for joint_a, joint_b in POSE_SKELETON:
+        a, b = joint_index.get(joint_a), joint_index.get(joint_b)
+        if a is not None and b is not None and visible[a] and visible[b]:
+            cv2.line(frame, tuple(pixels[a].tolist()), tuple(pixels[b].tolist()), (0, 255, 0), 2)
+    
+    visible_pixels = pixels[visible]
+    for x, y in visible_pixels.tolist():
+        cv2.circle(frame, (x, y), 4, (0, 0, 255), -1)
+    
+    x0, y0 = visible_pixels.min(axis=0).tolist()
+    x1, y1 = visible_pixels.max(axis=0).tolist()
+    cv2.rectangle(frame, (x0, y0), (x1, y1), (255, 200, 0), 2)
+
+
+def decode_upload(uploaded_file) -> Optional[np.ndarray]:
+    """Decode an uploaded image file to a BGR frame, or None if it is not a valid image"""
+    data = np.frombuffer(uploaded_file.getvalue(), np.uint8)
+    return cv2.imdecode(data, cv2.IMREAD_COLOR)
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """Get the shared HTTP session, which keeps connections to the API alive"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def call_api(endpoint: str, data: dict, files: Optional[List[Tuple[str, tuple]]] = None) -> dict:
+    """
+    Call API endpoint.
+    
+    Args:
+        endpoint: API path
+        data: Request fields, sent as JSON or, with files, as form fields
+        files: (field, (filename, bytes, content type)) multipart uploads
+    
+    Returns:
+        Decoded JSON response, or {} on error
+    """
     try:
-        response = requests.post(
-            f"{API_BASE_URL}{endpoint}",
-            json=data,
-            timeout=30
-        )
+        if files is not None:
+            response = get_session().post(
+                f"{API_BASE_URL}{endpoint}",
+                data=data,
+                files=files,
+                timeout=30
+            )
+        else:
+            # orjson serializes large base64 image strings much faster than json
+            response = get_session().post(
+                f"{API_BASE_URL}{endpoint}",
+                data=orjson.dumps(data),
+                headers={"Content-Type": "application/json"},
+                timeout=30
+            )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except Exception as e:
         st.error(f"API Error: {str(e)}")
         return {}
 
 
+@st.cache_data(ttl=STATUS_CACHE_TTL)
+def fetch_session_summary(session_id: str) -> dict:
+    """Fetch a session summary, cached briefly across reruns"""
+    response = get_session().get(f"{API_BASE_URL}/api/v1/session/{session_id}/summary", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+@st.cache_data(ttl=STATUS_CACHE_TTL)
+def fetch_agents() -> dict:
+    """Fetch agent status, cached briefly across reruns"""
+    response = get_session().get(f"{API_BASE_URL}/api/v1/agents", timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
 # Header
 st.title("💪 MindBody Strength Coach")
 st.markdown("**Multi-Agent Orchestration Framework** - Real-time form correction, nutrition estimation, and mindfulness coaching")
@@ -75,8 +280,7 @@ if page == "🏋️ Workout":
         st.subheader("Exercise Selection")
         exercise_type = st.selectbox(
             "Select Exercise",
-            ["squat", "pushup", "deadlift", "bicep_curl", "tricep_extension", 
-             "chest_press", "shoulder_press", "lunge", "plank", "row"]
+            EXERCISES
         )
         
         # Input mode selection
@@ -90,27 +294,35 @@ if page == "🏋️ Workout":
             # Camera input for single photo
             camera_input = st.camera_input("Take a photo of your exercise form", key="workout_camera")
             
-            if camera_input:
-                # Convert to PIL Image
-                image = Image.open(camera_input)
+            frame = decode_upload(camera_input) if camera_input else None
+            if camera_input and frame is None:
+                st.error("Could not read the captured photo. Please try again.")
+            
+            if frame is not None:
+                # Downscale the BGR frame to pose-model size
+                frame = downscale_frame(frame)
                 
                 # Encode frame
-                frame_b64 = encode_image(image)
+                frame_jpg = encode_jpeg(frame, quality=POSE_JPEG_QUALITY)
                 
                 # Call pose API
                 with st.spinner("Analyzing form..."):
-                    result = call_api("/api/v1/pose/infer", {
-                        "frames": [frame_b64],
+                    result = call_api("/api/v1/pose/infer/upload", {
                         "exercise_type": exercise_type,
                         "session_id": st.session_state.session_id,
                         "user_id": st.session_state.user_id
-                    })
+                    }, files=[("files", ("frame.jpg", frame_jpg, "image/jpeg"))])
                 
                 if result and "pose_analysis" in result:
                     pose_data = result["pose_analysis"]
                     
-                    # Display results
-                    st.image(image, caption="Current Frame", width=None)
+                    # Draw the detected pose straight onto the BGR array, then show
+                    # it as JPEG so Streamlit does not re-encode the raw array as PNG
+                    keypoints = pose_data.get("keypoints")
+                    if keypoints:
+                        draw_pose(frame, keypoints[0], pose_data.get("joint_names", []))
+                        frame_jpg = encode_jpeg(frame, quality=POSE_JPEG_QUALITY)
+                    st.image(frame_jpg, caption="Current Frame", width=None)
                     
                     if pose_data.get("success"):
                         # Form score
@@ -165,93 +377,67 @@ if page == "🏋️ Workout":
                 
                 # Process video frames
                 if st.button("Analyze Video", type="primary"):
-                    with st.spinner("Processing video frames..."):
-                        # For MVP, extract frames from video
-                        # In production, use OpenCV to extract frames
-                        import cv2
-                        import tempfile
-                        import os
+                    video_bytes = video_file.getvalue()
+                    video_key = (hashlib.md5(video_bytes, usedforsecurity=False).digest(), exercise_type)
+                    
+                    # Re-clicks on the same video and exercise reuse the last
+                    # analysis instead of uploading and decoding the video again
+                    if st.session_state.get("video_analysis_key") != video_key:
+                        # Drop the previous analysis before fetching a new one
+                        st.session_state.pop("video_analysis", None)
+                        st.session_state.pop("video_analysis_key", None)
+                        
+                        with st.spinner("Analyzing video..."):
+                            # The backend samples and decodes frames itself, so the
+                            # video is posted as-is
+                            result = call_api("/api/v1/pose/analyze_video", {
+                                "exercise_type": exercise_type,
+                                "session_id": st.session_state.session_id,
+                                "user_id": st.session_state.user_id
+                            }, files=[("video", (video_file.name, video_bytes, video_file.type or "video/mp4"))])
                         
-                        # Reset file pointer and save uploaded video temporarily
-                        video_file.seek(0)  # Reset file pointer
-                        with tempfile.NamedTemporaryFile(delete=False, suffix='.mp4') as tmp_file:
-                            tmp_file.write(video_file.read())
-                            tmp_path = tmp_file.name
+                        if result and "pose_analysis" in result:
+                            st.session_state.video_analysis = result
+                            st.session_state.video_analysis_key = video_key
+                    
+                    result = st.session_state.get("video_analysis", {})
+                    if result and "pose_analysis" in result:
+                        pose_data = result["pose_analysis"]
                         
-                        try:
-                            # Extract frames using OpenCV
-                            cap = cv2.VideoCapture(tmp_path)
-                            frames_b64 = []
-                            frame_count = 0
-                            max_frames = 30  # Limit to 30 frames for performance
+                        if pose_data.get("success"):
+                            # Display summary
+                            form_score = pose_data.get("form_score", {})
+                            score = form_score.get("overall_score", 0)
+                            grade = form_score.get("grade", "N/A")
                             
-                            while cap.isOpened() and frame_count < max_frames:
-                                ret, frame = cap.read()
-                                if not ret:
-                                    break
-                                
-                                # Convert BGR to RGB
-                                frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                                frame_pil = Image.fromarray(frame_rgb)
-                                frame_b64 = encode_image(frame_pil)
-                                frames_b64.append(frame_b64)
-                                frame_count += 1
+                            col_score, col_reps = st.columns(2)
+                            with col_score:
+                                st.metric("Overall Form Score", f"{score:.1f}/100", grade)
+                            with col_reps:
+                                rep_count = pose_data.get("rep_count", 0)
+                                st.metric("Total Reps", rep_count)
                             
-                            cap.release()
+                            # Form errors
+                            form_errors = pose_data.get("form_errors", {})
+                            top_errors = form_errors.get("top_errors", [])
                             
-                            if frames_b64:
-                                # Call pose API with all frames
-                                result = call_api("/api/v1/pose/infer", {
-                                    "frames": frames_b64,
-                                    "exercise_type": exercise_type,
-                                    "session_id": st.session_state.session_id,
-                                    "user_id": st.session_state.user_id
-                                })
-                                
-                                if result and "pose_analysis" in result:
-                                    pose_data = result["pose_analysis"]
-                                    
-                                    if pose_data.get("success"):
-                                        # Display summary
-                                        form_score = pose_data.get("form_score", {})
-                                        score = form_score.get("overall_score", 0)
-                                        grade = form_score.get("grade", "N/A")
-                                        
-                                        col_score, col_reps = st.columns(2)
-                                        with col_score:
-                                            st.metric("Overall Form Score", f"{score:.1f}/100", grade)
-                                        with col_reps:
-                                            rep_count = pose_data.get("rep_count", 0)
-                                            st.metric("Total Reps", rep_count)
-                                        
-                                        # Form errors
-                                        form_errors = pose_data.get("form_errors", {})
-                                        top_errors = form_errors.get("top_errors", [])
-                                        
-                                        if top_errors:
-                                            st.subheader("⚠️ Form Corrections Detected")
-                                            for error in top_errors:
-                                                severity = error.get("severity", 0.5)
-                                                color = "🔴" if severity > 0.7 else "🟡" if severity > 0.4 else "🟢"
-                                                st.write(f"{color} **{error.get('type', 'Error')}**: {error.get('message', '')}")
-                                        
-                                        # Recommendations
-                                        recommendations = form_errors.get("recommendations", [])
-                                        if recommendations:
-                                            st.subheader("💡 Recommendations")
-                                            for rec in recommendations:
-                                                st.write(f"• {rec}")
-                                        
-                                        # Trigger mindfulness if workout complete
-                                        if pose_data.get("workout_complete"):
-                                            st.success("🎉 Workout Complete! Check Mindfulness tab for a recovery session.")
-                            else:
-                                st.error("Could not extract frames from video")
-                        
-                        finally:
-                            # Clean up temp file
-                            if os.path.exists(tmp_path):
-                                os.unlink(tmp_path)
+                            if top_errors:
+                                st.subheader("⚠️ Form Corrections Detected")
+                                for error in top_errors:
+                                    severity = error.get("severity", 0.5)
+                                    color = "🔴" if severity > 0.7 else "🟡" if severity > 0.4 else "🟢"
+                                    st.write(f"{color} **{error.get('type', 'Error')}**: {error.get('message', '')}")
+                            
+                            # Recommendations
+                            recommendations = form_errors.get("recommendations", [])
+                            if recommendations:
+                                st.subheader("💡 Recommendations")
+                                for rec in recommendations:
+                                    st.write(f"• {rec}")
+                            
+                            # Trigger mindfulness if workout complete
+                            if pose_data.get("workout_complete"):
+                                st.success("🎉 Workout Complete! Check Mindfulness tab for a recovery session.")
     
     with col2:
         st.subheader("Session Info")
@@ -260,70 +446,7 @@ if page == "🏋️ Workout":
             st.write(f"**User ID**: {st.session_state.user_id}")
         
         st.subheader("Exercise Tips")
-        exercise_tips = {
-            "squat": """
-            **Squat Form Tips:**
-            - Keep knees aligned with ankles
-            - Maintain straight back
-            - Go below parallel for full depth
-            """,
-            "pushup": """
-            **Push-up Form Tips:**
-            - Keep body in straight line
-            - Lower chest to ground
-            - Engage core throughout
-            """,
-            "deadlift": """
-            **Deadlift Form Tips:**
-            - Keep back straight
-            - Hinge at hips
-            - Drive through heels
-            """,
-            "bicep_curl": """
-            **Bicep Curl Form Tips:**
-            - Keep elbows close to body
-            - Control the weight (no swinging)
-            - Full range of motion
-            """,
-            "tricep_extension": """
-            **Tricep Extension Form Tips:**
-            - Keep upper arms stationary
-            - Extend fully at bottom
-            - Control the negative
-            """,
-            "chest_press": """
-            **Chest Press Form Tips:**
-            - Keep shoulder blades retracted
-            - Lower to chest level
-            - Press in controlled motion
-            """,
-            "shoulder_press": """
-            **Shoulder Press Form Tips:**
-            - Keep core engaged
-            - Press straight up
-            - Don't arch back excessively
-            """,
-            "lunge": """
-            **Lunge Form Tips:**
-            - Step forward, not down
-            - Keep front knee over ankle
-            - Maintain upright torso
-            """,
-            "plank": """
-            **Plank Form Tips:**
-            - Keep body in straight line
-            - Engage core and glutes
-            - Don't let hips sag
-            """,
-            "row": """
-            **Row Form Tips:**
-            - Pull to lower chest/upper abs
-            - Squeeze shoulder blades
-            - Keep core engaged
-            """
-        }
-        
-        tip = exercise_tips.get(exercise_type, "Select an exercise to see tips")
+        tip = EXERCISE_TIPS.get(exercise_type, "Select an exercise to see tips")
         st.info(tip)
 
 # Nutrition Page
@@ -339,9 +462,13 @@ elif page == "🍎 Nutrition":
             type=["jpg", "jpeg", "png"]
         )
         
-        if uploaded_file:
-            image = Image.open(uploaded_file)
-            st.image(image, caption="Uploaded Image", width=None)
+        image = decode_upload(uploaded_file) if uploaded_file else None
+        if uploaded_file and image is None:
+            st.error("Could not read the uploaded file as an image.")
+        
+        if image is not None:
+            # Display the uploaded file bytes as-is rather than re-encoding the array
+            st.image(uploaded_file.getvalue(), caption="Uploaded Image", width=None)
             
             # Encode image
             image_b64 = encode_image(image)
@@ -489,20 +616,18 @@ elif page == "📊 Session Summary":
     st.header("Session Summary")
     
     if st.button("Refresh Summary"):
-        try:
-            response = requests.get(
-                f"{API_BASE_URL}/api/v1/session/{st.session_state.session_id}/summary",
-                timeout=10
-            )
-            response.raise_for_status()
-            summary = response.json()
-            st.session_state.session_summary = summary
-        except Exception as e:
-            st.error(f"Error loading summary: {str(e)}")
+        # An explicit refresh skips the cached responses
+        fetch_session_summary.clear()
+        fetch_agents.clear()
     
-    if "session_summary" in st.session_state:
-        summary = st.session_state.session_summary
-        
+    # Reruns within STATUS_CACHE_TTL reuse the cached summary
+    summary = None
+    try:
+        summary = fetch_session_summary(st.session_state.session_id)
+    except Exception as e:
+        st.error(f"Error loading summary: {str(e)}")
+    
+    if summary:
         col1, col2 = st.columns(2)
         
         with col1:
@@ -521,9 +646,7 @@ elif page == "📊 Session Summary":
     # Agent status
     st.subheader("Agent Status")
     try:
-        response = requests.get(f"{API_BASE_URL}/api/v1/agents", timeout=10)
-        response.raise_for_status()
-        agents = response.json()
+        agents = fetch_agents()
         
         for agent_name, agent_info in agents.items():
             status = "✅" if agent_info.get("initialized") else "❌"
@@ -45,9 +45,11 @@ async def test_system():
     
     # Initialize agents
     print("2. Initializing agents...")
-    await pose_agent.initialize()
-    await nutrition_agent.initialize()
-    await mindfulness_agent.initialize()
+    await asyncio.gather(
+        pose_agent.initialize(),
+        nutrition_agent.initialize(),
+        mindfulness_agent.initialize()
+    )
     print("   ✅ All agents initialized\n")
     
     # Create orchestration engine
@@ -64,18 +66,30 @@ async def test_system():
     )
     print("   ✅ Orchestration engine created\n")
     
-    # Test 1: Pose Agent
-    print("4. Testing Pose Agent...")
+    # Pose and nutrition are independent, so they run concurrently
     session_id = "test_session_1"
-    pose_response = await engine.execute_agent(
-        agent_name=AgentRole.POSE.value,
-        task={
-            "frames": ["mock_frame_1", "mock_frame_2"],
-            "exercise_type": "squat",
-            "mode": "real_time"
-        },
-        session_id=session_id
+    pose_response, nutrition_response = await asyncio.gather(
+        engine.execute_agent(
+            agent_name=AgentRole.POSE.value,
+            task={
+                "frames": ["mock_frame_1", "mock_frame_2"],
+                "exercise_type": "squat",
+                "mode": "real_time"
+            },
+            session_id=session_id
+        ),
+        engine.execute_agent(
+            agent_name=AgentRole.NUTRITION.value,
+            task={
+                "image": "mock_food_image",
+                "mode": "estimate"
+            },
+            session_id=session_id
+        )
     )
+    
+    # Test 1: Pose Agent
+    print("4. Testing Pose Agent...")
     assert pose_response.success, "Pose agent should succeed"
     print(f"   ✅ Pose agent executed: {pose_response.execution_time:.3f}s")
     print(f"   📊 Rep count: {pose_response.data.get('rep_count', 0)}")
@@ -83,21 +97,13 @@ async def test_system():
     
     # Test 2: Nutrition Agent
     print("5. Testing Nutrition Agent...")
-    nutrition_response = await engine.execute_agent(
-        agent_name=AgentRole.NUTRITION.value,
-        task={
-            "image": "mock_food_image",
-            "mode": "estimate"
-        },
-        session_id=session_id
-    )
     assert nutrition_response.success, "Nutrition agent should succeed"
     print(f"   ✅ Nutrition agent executed: {nutrition_response.execution_time:.3f}s")
     nutrition_data = nutrition_response.data.get("nutrition", {})
     print(f"   📊 Calories: {nutrition_data.get('calories', 0)}")
     print(f"   📊 Protein: {nutrition_data.get('protein_grams', 0)}g\n")
     
-    # Test 3: Mindfulness Agent
+    # Test 3: Mindfulness Agent (depends on the pose summary)
     print("6. Testing Mindfulness Agent...")
     mindfulness_response = await engine.execute_agent(
         agent_name=AgentRole.MINDFULNESS.value,